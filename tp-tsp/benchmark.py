@@ -0,0 +1,238 @@
+"""
+Modulo de evaluacion de rendimiento.
+
+Ejecuta cada algoritmo de main.ALGO_NAMES sobre un conjunto de instancias
+y varias semillas, sin graficar. Para cada ejecucion registra el tiempo,
+las iteraciones, las iteraciones por segundo, la longitud del tour y la
+diferencia relativa (gap) con el optimo conocido de la instancia. Como
+no todas las instancias tienen un optimo conocido, tambien se registra la
+diferencia con la cota inferior de Held-Karp (ver bound.py), que se
+calcula una vez por instancia.
+
+Las ejecuciones se guardan en PREFIX.csv y el resumen por instancia y
+algoritmo en PREFIX.json. El resumen puede utilizarse luego como linea
+de base (--baseline) para detectar regresiones de tiempo o de calidad.
+
+Uso:
+    python benchmark.py [instancias ...] [-s SEEDS] [-o PREFIX] [-b baseline.json] [--no-bound]
+"""
+
+from __future__ import annotations
+import csv
+import glob
+import json
+import os
+import random
+import sys
+import numpy as np
+import parse
+import load
+import problem
+from bound import held_karp
+from main import ALGO_NAMES, build_algos
+
+# Longitud del tour optimo de las instancias de TSPLIB
+OPTIMA = {
+    'pr76': 108159,
+    'berlin52': 7542,
+    'att48': 10628,
+    'ulysses16': 6859,
+    'burma14': 3323,
+}
+
+# Tiempo medio (en segundos) por debajo del cual no se comparan tiempos,
+# las mediciones tan cortas son dominadas por el ruido
+MIN_TIME = 0.05
+
+# Columnas del archivo CSV de ejecuciones
+FIELDS = ['instance', 'n', 'algo', 'seed', 'length', 'time', 'iters', 'iters_per_sec', 'gap',
+          'bound', 'bound_gap']
+
+
+def run(filename: str, algos: list[str], seeds: int, init: str = 'identity',
+        neighbors: int | None = None, workers: int | None = None,
+        bound: bool = True) -> list[dict]:
+    """Ejecuta los algoritmos sobre una instancia con cada semilla.
+
+    Todos los algoritmos parten del mismo estado inicial, y antes de cada
+    ejecucion se fija la semilla, de modo que el resultado de un
+    algoritmo no depende de los demas.
+
+    Argumentos:
+    ==========
+    filename: str
+        ruta de la instancia
+    algos: list[str]
+        nombres de los algoritmos (ver main.ALGO_NAMES)
+    seeds: int
+        cantidad de semillas, se utilizan 0, 1, ..., seeds-1
+    init: str
+        heuristica del estado inicial (ver TSP.construct)
+    neighbors: int | None
+        cantidad de vecinos candidatos por ciudad
+    workers: int | None
+        cantidad de procesos para los reinicios de HillClimbingReset
+    bound: bool
+        True para calcular la cota de Held-Karp de la instancia
+
+    Retorno:
+    =======
+    runs: list[dict]
+        una fila por ejecucion, con las columnas de FIELDS
+    """
+    name = os.path.splitext(os.path.basename(filename))[0]
+    coords, kind = load.read_coords(filename)
+    p = problem.TSP.from_coords(coords, kind, neighbors=neighbors)
+    lower = held_karp(p)[0] if bound else None
+    runs = []
+    for seed in range(seeds):
+        random.seed(seed)
+        init_state = p.construct(init)
+        instances = build_algos(workers, seed)
+        for algo_name in algos:
+            algo = instances[algo_name]
+            p.init = list(init_state)  # HillClimbingReset modifica el estado inicial
+            random.seed(seed)
+            algo.solve(p)
+            if algo.value is None:
+                print("Fallo", algo_name, "en", name, file=sys.stderr)
+                continue
+            length = -algo.value
+            runs.append({
+                'instance': name,
+                'n': p.n,
+                'algo': algo_name,
+                'seed': seed,
+                'length': length,
+                'time': algo.time,
+                'iters': algo.niters,
+                'iters_per_sec': algo.niters / algo.time if algo.time > 0 else None,
+                'gap': length / OPTIMA[name] - 1 if name in OPTIMA else None,
+                'bound': lower,
+                'bound_gap': length / lower - 1 if lower else None,
+            })
+    return runs
+
+
+def summarize(runs: list[dict]) -> list[dict]:
+    """Resume las ejecuciones por instancia y algoritmo.
+
+    Retorno:
+    =======
+    summary: list[dict]
+        una fila por par (instancia, algoritmo) con la mejor longitud,
+        la longitud media, el gap de ambas, la cota de Held-Karp y el gap
+        medio respecto de ella, y el tiempo, las iteraciones y las
+        iteraciones por segundo medios
+    """
+    groups = {}
+    for r in runs:
+        groups.setdefault((r['instance'], r['algo']), []).append(r)
+    summary = []
+    for (instance, algo), group in groups.items():
+        length = np.array([r['length'] for r in group])
+        elapsed = sum(r['time'] for r in group)
+        iters = sum(r['iters'] for r in group)
+        opt = OPTIMA.get(instance)
+        lower = group[0]['bound']
+        summary.append({
+            'instance': instance,
+            'n': group[0]['n'],
+            'algo': algo,
+            'runs': len(group),
+            'best': float(length.min()),
+            'mean': float(length.mean()),
+            'gap_best': float(length.min() / opt - 1) if opt else None,
+            'gap_mean': float(length.mean() / opt - 1) if opt else None,
+            'bound': lower,
+            'bound_gap': float(length.mean() / lower - 1) if lower else None,
+            'time': elapsed / len(group),
+            'iters': iters / len(group),
+            'iters_per_sec': iters / elapsed if elapsed > 0 else None,
+        })
+    return summary
+
+
+def compare(summary: list[dict], baseline: list[dict], tolerance: float) -> list[dict]:
+    """Compara un resumen con una linea de base.
+
+    Un par (instancia, algoritmo) es una regresion si su longitud media o
+    su tiempo medio superan en mas de tolerance (relativo) a los de la
+    linea de base. Los tiempos menores a MIN_TIME no se comparan.
+
+    Retorno:
+    =======
+    rows: list[dict]
+        una fila por par presente en ambos resumenes, con las razones
+        'quality' y 'speed' (valor actual / valor de base) y la lista de
+        regresiones 'regressions'
+    """
+    base = {(b['instance'], b['algo']): b for b in baseline}
+    rows = []
+    for s in summary:
+        b = base.get((s['instance'], s['algo']))
+        if b is None:
+            continue
+        quality = s['mean'] / b['mean'] if b['mean'] else 1.0
+        speed = s['time'] / b['time'] if b['time'] else 1.0
+        regressions = []
+        if quality > 1 + tolerance:
+            regressions.append('quality')
+        if speed > 1 + tolerance and max(s['time'], b['time']) >= MIN_TIME:
+            regressions.append('time')
+        rows.append({'instance': s['instance'], 'algo': s['algo'],
+                     'quality': quality, 'speed': speed, 'regressions': regressions})
+    return rows
+
+
+def main() -> None:
+    """Funcion principal."""
+    args = parse.parse_benchmark()
+    instances = args.instances
+    if not instances:
+        here = os.path.dirname(os.path.abspath(__file__))
+        instances = sorted(glob.glob(os.path.join(here, 'instances', '*.tsp')))
+    algos = args.algos if args.algos is not None else ALGO_NAMES
+    unknown = set(algos) - set(ALGO_NAMES)
+    if unknown:
+        raise SystemExit("Algoritmos desconocidos: {}".format(", ".join(sorted(unknown))))
+
+    runs = []
+    for filename in instances:
+        runs.extend(run(filename, algos, args.seeds, args.init, args.neighbors, args.workers,
+                        args.bound))
+    summary = summarize(runs)
+
+    with open(args.output + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(runs)
+    with open(args.output + '.json', 'w') as f:
+        json.dump({'seeds': args.seeds, 'init': args.init, 'neighbors': args.neighbors,
+                   'summary': summary}, f, indent=2)
+
+    # Mostrar resultados por linea de comandos
+    print("Instancia:", "Algoritmo:", "Mejor:", "Media:", "Gap:", "Gap cota:", "Tiempo:",
+          "Iters/s:", sep="\t")
+    for s in summary:
+        gap = "%.2f%%" % (100 * s['gap_mean']) if s['gap_mean'] is not None else "-"
+        bound_gap = "%.2f%%" % (100 * s['bound_gap']) if s['bound_gap'] is not None else "-"
+        ips = "%.0f" % s['iters_per_sec'] if s['iters_per_sec'] is not None else "-"
+        print(s['instance'], s['algo'], s['best'], "%.1f" % s['mean'], gap, bound_gap,
+              "%.3f" % s['time'], ips, sep="\t")
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['summary']
+        rows = compare(summary, baseline, args.tolerance)
+        print()
+        print("Instancia:", "Algoritmo:", "Calidad:", "Tiempo:", "Regresion:", sep="\t")
+        for r in rows:
+            print(r['instance'], r['algo'], "%.3f" % r['quality'], "%.2fx" % r['speed'],
+                  ",".join(r['regressions']) or "-", sep="\t")
+        if any(r['regressions'] for r in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Este modulo calcula cotas inferiores de la longitud del tour optimo.
+
+Un 1-arbol es un arbol generador minimo de las ciudades 1, ..., n-1 mas
+las dos aristas mas cortas de la ciudad 0. Todo tour es un 1-arbol en el
+que cada ciudad tiene grado 2, por lo que el 1-arbol minimo es una cota
+inferior de la longitud del tour optimo.
+
+La cota de Held-Karp mejora esa cota con penalidades pi por ciudad: el
+1-arbol minimo con distancias d[u, v] + pi[u] + pi[v], menos 2 * sum(pi),
+sigue siendo una cota inferior. Las penalidades se ajustan por
+optimizacion por subgradientes: se aumenta la penalidad de las ciudades
+con grado mayor que 2 y se reduce la de las hojas.
+
+Cada 1-arbol se calcula con el algoritmo de Prim en O(n^2) sobre la
+matriz de distancias, fila por fila, por lo que tambien funciona con
+distance.DistanceOracle sin construir la matriz.
+
+Requiere del paquete numpy.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+import numpy as np
+
+if TYPE_CHECKING:
+    from problem import TSP
+
+# Cantidad maxima de iteraciones de la optimizacion por subgradientes
+MAX_ITERS = 1000
+
+# Iteraciones sin mejorar la cota tras las que se reduce el paso a la mitad
+PATIENCE = 20
+
+# Factor del paso por debajo del cual se detiene la optimizacion
+MIN_STEP = 1e-4
+
+
+def one_tree(dist: Any, pi: np.ndarray) -> tuple[float, np.ndarray]:
+    """Calcula el 1-arbol minimo con distancias d[u, v] + pi[u] + pi[v].
+
+    Argumentos:
+    ==========
+    dist: Any
+        matriz de distancias, o un objeto que retorna sus filas con
+        dist[u] (ver distance.DistanceOracle)
+    pi: np.ndarray
+        penalidad de cada ciudad
+
+    Retorno:
+    =======
+    cost: float
+        costo del 1-arbol con las distancias penalizadas
+    degree: np.ndarray
+        grado de cada ciudad en el 1-arbol
+    """
+    n = len(pi)
+    degree = np.zeros(n, dtype=np.int64)
+    # Prim sobre las ciudades 1, ..., n-1, empezando por la ciudad 1
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = in_tree[1] = True
+    key = np.asarray(dist[1], dtype=float) + pi + pi[1]
+    key[in_tree] = np.inf
+    parent = np.ones(n, dtype=np.intp)
+    cost = 0.0
+    for _ in range(n - 2):
+        v = int(np.argmin(key))
+        cost += key[v]
+        degree[v] += 1
+        degree[parent[v]] += 1
+        in_tree[v] = True
+        key[v] = np.inf
+        row = np.asarray(dist[v], dtype=float) + pi + pi[v]
+        better = (row < key) & ~in_tree
+        key[better] = row[better]
+        parent[better] = v
+    # Las dos aristas mas cortas de la ciudad 0
+    row = np.asarray(dist[0], dtype=float)[1:] + pi[1:] + pi[0]
+    nearest = np.argpartition(row, 1)[:2]
+    cost += float(row[nearest].sum())
+    degree[nearest + 1] += 1
+    degree[0] = 2
+    return float(cost), degree
+
+
+def held_karp(problem: TSP, upper: float | None = None,
+              max_iters: int = MAX_ITERS) -> tuple[float, np.ndarray]:
+    """Calcula la cota inferior de Held-Karp de la longitud del tour optimo.
+
+    El paso de la iteracion k es el de Polyak,
+        t = step * (upper - L(pi)) / ||g||^2,
+    donde g = grado - 2 es el subgradiente y step comienza en 2 y se reduce
+    a la mitad tras PATIENCE iteraciones sin mejorar la cota.
+
+    Argumentos:
+    ==========
+    problem: TSP
+        una instancia del TSP; con menos de 3 ciudades el unico tour no
+        forma un 1-arbol y se retorna su longitud, que es exacta
+    upper: float | None
+        longitud de algun tour, si es None se utiliza la del tour goloso
+        (ver construct.greedy)
+    max_iters: int
+        cantidad maxima de iteraciones (por defecto MAX_ITERS)
+
+    Retorno:
+    =======
+    bound: float
+        la mejor cota inferior encontrada
+    pi: np.ndarray
+        las penalidades que alcanzan la cota
+    """
+    n = problem.n
+    dist = problem.dist
+    if n < 3:
+        # el unico tour recorre la arista (0, 1) de ida y vuelta, o ninguna
+        return (2 * float(dist[0, 1]) if n == 2 else 0.0), np.zeros(n)
+    if upper is None:
+        upper = -problem.obj_val(problem.construct('greedy'))
+    pi = np.zeros(n)
+    best, best_pi = float('-inf'), pi.copy()
+    step = 2.0
+    stale = 0
+    for _ in range(max_iters):
+        cost, degree = one_tree(dist, pi)
+        bound = cost - 2 * pi.sum()
+        if bound > best + 1e-9:
+            best, best_pi = bound, pi.copy()
+            stale = 0
+        else:
+            stale += 1
+            if stale >= PATIENCE:
+                step /= 2
+                stale = 0
+                if step < MIN_STEP:
+                    break
+        g = degree - 2
+        norm = float(g @ g)
+        if norm == 0 or best >= upper:
+            # el 1-arbol es un tour, la cota es optima
+            break
+        pi += step * (upper - bound) / norm * g
+    return best, best_pi
@@ -0,0 +1,336 @@
+"""Este modulo define heuristicas constructivas para el TSP.
+
+Cada heuristica recibe una instancia de problem.TSP y construye un estado
+de la forma [0, ..., 0] que puede utilizarse como estado inicial de una
+busqueda local (ver TSP.construct). Un buen tour inicial ahorra la mayor
+parte de las iteraciones que la busqueda dedica a corregir un tour malo.
+
+Heuristicas disponibles (ver CONSTRUCTIONS):
+
+* identity: el tour [0, 1, ..., n-1, 0].
+* random: una permutacion aleatoria.
+* nn: vecino mas cercano, empezando por la ciudad 0.
+* greedy: agrega las aristas de menor a mayor longitud mientras formen
+caminos (greedy edge).
+* christofides: arbol generador minimo mas un apareamiento goloso de los
+vertices de grado impar, recorrido euleriano y atajos.
+* hilbert: ordena las ciudades segun la curva de Hilbert.
+
+Las heuristicas que buscan ciudades cercanas utilizan las listas de
+vecinos del problema (o listas de 10 vecinos calculadas con
+distance.nearest_neighbors), por lo que no recorren las O(n^2) aristas.
+
+Requiere del paquete numpy.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+from random import shuffle
+import numpy as np
+import distance
+
+if TYPE_CHECKING:
+    from problem import TSP
+
+# Cantidad de vecinos candidatos si el problema no tiene listas de vecinos
+NEIGHBORS = 10
+
+# Orden de la curva de Hilbert, la grilla tiene 2^ORDER x 2^ORDER celdas
+HILBERT_ORDER = 16
+
+
+def identity(problem: TSP) -> list[int]:
+    """Tour que recorre las ciudades en orden."""
+    return list(range(problem.n)) + [0]
+
+
+def random_tour(problem: TSP) -> list[int]:
+    """Tour aleatorio que comienza y termina en la ciudad 0."""
+    cities = list(range(1, problem.n))
+    shuffle(cities)
+    return [0] + cities + [0]
+
+
+def nearest_neighbor(problem: TSP) -> list[int]:
+    """Construye un tour con la heuristica del vecino mas cercano.
+
+    Desde la ultima ciudad visitada se elige el primer vecino no visitado
+    de su lista de candidatos. Solo si todos ya fueron visitados se busca
+    entre todas las ciudades no visitadas.
+    """
+    n = problem.n
+    neigh = _candidates(problem).tolist()
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    # ciudades no visitadas, se compacta al buscar entre todas
+    unvisited = np.arange(1, n)
+    tour = [0]
+    city = 0
+    for _ in range(n - 1):
+        for v in neigh[city]:
+            if not visited[v]:
+                break
+        else:
+            unvisited = unvisited[~visited[unvisited]]
+            v = int(unvisited[np.argmin(problem.dist[city, unvisited])])
+        visited[v] = True
+        tour.append(v)
+        city = v
+    tour.append(0)
+    return tour
+
+
+def greedy(problem: TSP) -> list[int]:
+    """Construye un tour con la heuristica golosa de aristas.
+
+    Las aristas candidatas (u, v) se recorren de menor a mayor longitud y
+    se agregan si u y v tienen grado menor a 2 y no cierran un ciclo. Los
+    caminos que resultan se unen con la heuristica del vecino mas cercano.
+    """
+    n = problem.n
+    u, v, length = _candidate_edges(problem)
+    order = np.argsort(length, kind='stable')
+    parent = list(range(n))
+    degree = [0] * n
+    adj = [[] for _ in range(n)]
+    added = 0
+    for a, b in zip(u[order].tolist(), v[order].tolist()):
+        if degree[a] >= 2 or degree[b] >= 2:
+            continue
+        ra, rb = _find(parent, a), _find(parent, b)
+        if ra == rb:
+            continue
+        parent[ra] = rb
+        degree[a] += 1
+        degree[b] += 1
+        adj[a].append(b)
+        adj[b].append(a)
+        added += 1
+        if added == n - 1:
+            break
+    return _chain(problem, _paths(n, adj))
+
+
+def christofides(problem: TSP) -> list[int]:
+    """Construye un tour con una version simplificada de Christofides.
+
+    Se calcula el arbol generador minimo sobre las aristas candidatas
+    (uniendo las componentes si el grafo de candidatos no es conexo), se
+    aparean de forma golosa los vertices de grado impar, se recorre el
+    multigrafo resultante con un circuito euleriano y se omiten las
+    ciudades repetidas. El apareamiento no es de peso minimo, por lo que
+    no se garantiza la cota de 3/2 del algoritmo original.
+    """
+    n = problem.n
+    adj = [[] for _ in range(n)]
+    for a, b in _spanning_tree(problem):
+        adj[a].append(b)
+        adj[b].append(a)
+    odd = np.array([c for c in range(n) if len(adj[c]) % 2 == 1], dtype=np.int64)
+    for a, b in _matching(problem, odd):
+        adj[a].append(b)
+        adj[b].append(a)
+
+    # Circuito euleriano (Hierholzer), cada arista se usa una vez
+    stack = [0]
+    circuit = []
+    while stack:
+        c = stack[-1]
+        if adj[c]:
+            d = adj[c].pop()
+            adj[d].remove(c)
+            stack.append(d)
+        else:
+            circuit.append(stack.pop())
+    # Atajos: omitir las ciudades ya visitadas
+    visited = np.zeros(n, dtype=bool)
+    tour = []
+    for c in circuit:
+        if not visited[c]:
+            visited[c] = True
+            tour.append(c)
+    return _rotate(tour)
+
+
+def hilbert(problem: TSP) -> list[int]:
+    """Construye un tour recorriendo las ciudades segun la curva de Hilbert.
+
+    Requiere las coordenadas de las ciudades. El costo es O(n log n).
+    """
+    if problem.coords is None:
+        raise ValueError("La curva de Hilbert requiere las coordenadas de las ciudades")
+    xy = np.asarray(problem.coords, dtype=np.float64)
+    side = (1 << HILBERT_ORDER) - 1
+    low = xy.min(axis=0)
+    extent = max(float((xy.max(axis=0) - low).max()), 1e-9)
+    grid = np.round((xy - low) / extent * side).astype(np.int64)
+    return _rotate(np.argsort(_hilbert_index(grid[:, 0], grid[:, 1]), kind='stable').tolist())
+
+
+def _hilbert_index(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Posicion de cada punto (x, y) de la grilla sobre la curva de Hilbert."""
+    x, y = x.copy(), y.copy()
+    d = np.zeros_like(x)
+    s = 1 << (HILBERT_ORDER - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # rotar el cuadrante para que la curva sea continua
+        flip = ~ry & rx
+        x = np.where(flip, s - 1 - x, x)
+        y = np.where(flip, s - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return d
+
+
+def _candidates(problem: TSP) -> np.ndarray:
+    """Listas de vecinos candidatos del problema, calculandolas si no existen."""
+    if problem.neighbors is not None:
+        return problem.neighbors
+    return distance.nearest_neighbors(NEIGHBORS, problem.dist, problem.coords, problem.kind)
+
+
+def _candidate_edges(problem: TSP) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aristas candidatas (u[m], v[m]) sin repeticiones y sus longitudes."""
+    neigh = _candidates(problem)
+    n, k = neigh.shape
+    u = np.repeat(np.arange(n), k)
+    v = neigh.ravel().astype(np.int64)
+    key = np.unique(np.minimum(u, v) * n + np.maximum(u, v))
+    u, v = key // n, key % n
+    return u, v, np.asarray(problem.dist[u, v])
+
+
+def _find(parent: list[int], a: int) -> int:
+    """Representante del conjunto de a (union-find con compresion de caminos)."""
+    root = a
+    while parent[root] != root:
+        root = parent[root]
+    while parent[a] != root:
+        parent[a], a = root, parent[a]
+    return root
+
+
+def _spanning_tree(problem: TSP) -> list[tuple[int, int]]:
+    """Arbol generador minimo (Kruskal) sobre las aristas candidatas.
+
+    Si el grafo de candidatos no es conexo, las componentes se unen con la
+    arista mas corta desde la componente mas chica hacia el resto.
+    """
+    n = problem.n
+    u, v, length = _candidate_edges(problem)
+    order = np.argsort(length, kind='stable')
+    parent = list(range(n))
+    tree = []
+    for a, b in zip(u[order].tolist(), v[order].tolist()):
+        ra, rb = _find(parent, a), _find(parent, b)
+        if ra != rb:
+            parent[ra] = rb
+            tree.append((a, b))
+    while len(tree) < n - 1:
+        roots = np.array([_find(parent, c) for c in range(n)])
+        labels, sizes = np.unique(roots, return_counts=True)
+        inside = roots == labels[np.argmin(sizes)]
+        comp, rest = np.flatnonzero(inside), np.flatnonzero(~inside)
+        best = (np.inf, -1, -1)
+        for a in comp.tolist():
+            d = problem.dist[a, rest]
+            m = int(np.argmin(d))
+            if d[m] < best[0]:
+                best = (d[m], a, int(rest[m]))
+        _, a, b = best
+        parent[_find(parent, a)] = _find(parent, b)
+        tree.append((a, b))
+    return tree
+
+
+def _matching(problem: TSP, odd: np.ndarray) -> list[tuple[int, int]]:
+    """Apareamiento goloso de un conjunto de ciudades (de tamaño par).
+
+    Se consideran primero los pares de vecinos cercanos dentro del conjunto,
+    de menor a mayor distancia; las ciudades que quedan sin pareja se
+    aparean en el orden de un recorrido del vecino mas cercano.
+    """
+    m = len(odd)
+    if m == 0:
+        return []
+    k = min(NEIGHBORS, m - 1)
+    if problem.coords is not None and problem.kind in distance.EUCLIDEAN:
+        neigh = distance.nearest_neighbors(k, xy=np.asarray(problem.coords)[odd], kind=problem.kind)
+    else:
+        neigh = distance.nearest_neighbors(k, dist=problem.dist[odd[:, None], odd[None, :]])
+    a = np.repeat(np.arange(m), k)
+    b = neigh.ravel().astype(np.int64)
+    length = np.asarray(problem.dist[odd[a], odd[b]])
+    matched = np.zeros(m, dtype=bool)
+    pairs = []
+    order = np.argsort(length, kind='stable')
+    for x, y in zip(a[order].tolist(), b[order].tolist()):
+        if not matched[x] and not matched[y]:
+            matched[x] = matched[y] = True
+            pairs.append((int(odd[x]), int(odd[y])))
+    left = odd[~matched]
+    if len(left):
+        walk = _chain(problem, [[c] for c in left.tolist()], rotate=False)
+        pairs.extend(zip(walk[0::2], walk[1::2]))
+    return pairs
+
+
+def _paths(n: int, adj: list[list[int]]) -> list[list[int]]:
+    """Recupera los caminos de un grafo acíclico con grado maximo 2."""
+    seen = np.zeros(n, dtype=bool)
+    paths = []
+    for start in range(n):
+        if seen[start] or len(adj[start]) == 2:
+            continue
+        path = [start]
+        seen[start] = True
+        prev, city = -1, start
+        while True:
+            nxt = [c for c in adj[city] if c != prev]
+            if not nxt:
+                break
+            prev, city = city, nxt[0]
+            seen[city] = True
+            path.append(city)
+        paths.append(path)
+    return paths
+
+
+def _chain(problem: TSP, paths: list[list[int]], rotate: bool = True) -> list[int]:
+    """Une caminos disjuntos en un tour con la heuristica del vecino mas cercano.
+
+    Desde el extremo final del ultimo camino agregado se elige el extremo
+    mas cercano de un camino no utilizado, que se agrega en el sentido
+    correspondiente.
+    """
+    ends = np.array([c for p in paths for c in (p[0], p[-1])], dtype=np.int64)
+    alive = np.ones(len(ends), dtype=bool)
+    alive[:2] = False
+    tour = list(paths[0])
+    for _ in range(len(paths) - 1):
+        d = np.where(alive, problem.dist[tour[-1], ends], np.inf)
+        m = int(np.argmin(d))
+        path = paths[m // 2]
+        tour.extend(path if m % 2 == 0 else reversed(path))
+        alive[m - m % 2:m - m % 2 + 2] = False
+    return _rotate(tour) if rotate else tour
+
+
+def _rotate(order: list[int]) -> list[int]:
+    """Convierte una permutacion de las ciudades en un estado [0, ..., 0]."""
+    start = order.index(0)
+    return order[start:] + order[:start] + [0]
+
+
+# Heuristicas constructivas disponibles, ver TSP.construct
+CONSTRUCTIONS: dict[str, Callable[[TSP], list[int]]] = {
+    'identity': identity,
+    'random': random_tour,
+    'nn': nearest_neighbor,
+    'greedy': greedy,
+    'christofides': christofides,
+    'hilbert': hilbert,
+}
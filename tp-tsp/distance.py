@@ -0,0 +1,490 @@
+"""Este modulo se encarga del calculo de distancias entre ciudades.
+
+Las distancias se almacenan en una matriz densa de numpy (float64) de
+tamaño n x n, donde la ciudad i del grafo (enumerado de 1 a n) corresponde
+a la fila i-1 de la matriz.
+
+Las matrices pueden guardarse en disco junto a la instancia (ver
+cached_matrix) y leerse como memoria mapeada. Si el directorio no
+admite escritura, la matriz se calcula en memoria.
+
+Para instancias muy grandes, donde la matriz no entra en memoria, la
+clase DistanceOracle calcula las distancias a partir de las coordenadas
+a medida que se consultan, con la misma interfaz de indexacion.
+
+Requiere del paquete numpy.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+from functools import lru_cache
+import hashlib
+import logging
+import os
+import numpy as np
+
+if TYPE_CHECKING:
+    from networkx import Graph
+
+logger = logging.getLogger(__name__)
+
+# Ciudades por cubeta del arbol kd de nearest_neighbors
+NEIGHBOR_BUCKET = 32
+
+# Tipos de distancia que crecen con la distancia euclidea, donde el arbol kd
+# de nearest_neighbors da el mismo orden que la matriz de distancias
+EUCLIDEAN = frozenset({'EUC_2D', 'CEIL_2D', 'ATT'})
+
+# Radio de la Tierra utilizado por TSPLIB para instancias GEO
+EARTH_RADIUS = 6378.388
+
+
+def coords_array(coords: dict[int, tuple[float, float]]) -> np.ndarray:
+    """Convierte un diccionario de coordenadas en un arreglo de numpy.
+
+    Argumentos:
+    ==========
+    coords: dict[int, tuple[float, float]]
+        diccionario con las coordenadas de cada ciudad (de 1 a n)
+
+    Retorno:
+    =======
+    xy: np.ndarray
+        arreglo de tamaño n x 2, la fila i-1 corresponde a la ciudad i
+    """
+    return np.array([coords[i] for i in sorted(coords)], dtype=np.float64)
+
+
+def from_graph(G: Graph) -> np.ndarray:
+    """Construye la matriz de distancias a partir del grafo del TSP.
+
+    Argumentos:
+    ==========
+    G: Graph
+        grafo con los datos del problema, los nodos se enumeran de 1 a n
+
+    Retorno:
+    =======
+    dist: np.ndarray
+        matriz de distancias de tamaño n x n
+    """
+    n = G.number_of_nodes()
+    dist = np.zeros((n, n), dtype=np.float64)
+    for u, v, w in G.edges(data='weight'):
+        dist[u - 1, v - 1] = w
+        dist[v - 1, u - 1] = w
+    np.fill_diagonal(dist, 0)
+    return dist
+
+
+def _geo_radians(x: np.ndarray) -> np.ndarray:
+    """Convierte coordenadas GEO (formato DDD.MM) a radianes."""
+    degrees = np.trunc(x)
+    return np.radians(degrees + (x - degrees) * 5 / 3)
+
+
+def pairwise(a: np.ndarray, b: np.ndarray, kind: str) -> np.ndarray:
+    """Calcula las distancias entre pares de coordenadas.
+
+    Las formulas y el redondeo son los de TSPLIB, de modo que los valores
+    coinciden con los pesos del grafo construido por tsplib95.
+    Los arreglos a y b deben ser compatibles para broadcasting.
+
+    Argumentos:
+    ==========
+    a: np.ndarray
+        coordenadas de origen, de forma (..., 2)
+    b: np.ndarray
+        coordenadas de destino, de forma (..., 2)
+    kind: str
+        tipo de distancia (EDGE_WEIGHT_TYPE)
+
+    Retorno:
+    =======
+    dist: np.ndarray
+        distancias entre cada par de coordenadas
+    """
+    if kind == 'GEO':
+        lat1, lng1 = _geo_radians(a[..., 0]), _geo_radians(a[..., 1])
+        lat2, lng2 = _geo_radians(b[..., 0]), _geo_radians(b[..., 1])
+        q1 = np.cos(lng1 - lng2)
+        q2 = np.cos(lat1 - lat2)
+        q3 = np.cos(lat1 + lat2)
+        arg = np.clip(0.5 * ((1 + q1) * q2 - (1 - q1) * q3), -1, 1)
+        return np.trunc(EARTH_RADIUS * np.arccos(arg) + 1)
+
+    delta = a - b
+    if kind == 'MAN_2D':
+        return np.trunc(np.abs(delta).sum(axis=-1) + 0.5)
+    if kind == 'MAX_2D':
+        return np.trunc(np.abs(delta).max(axis=-1) + 0.5)
+
+    square = (delta * delta).sum(axis=-1)
+    if kind == 'EUC_2D':
+        return np.trunc(np.sqrt(square) + 0.5)
+    if kind == 'CEIL_2D':
+        return np.ceil(np.sqrt(square))
+    if kind == 'ATT':
+        value = np.sqrt(square / 10)
+        rounded = np.trunc(value + 0.5)
+        return np.where(rounded < value, rounded + 1, rounded)
+    raise ValueError("Tipo de distancia no soportado: {}".format(kind))
+
+
+def from_coords(xy: np.ndarray, kind: str = 'EUC_2D') -> np.ndarray:
+    """Construye la matriz de distancias a partir de las coordenadas.
+
+    Argumentos:
+    ==========
+    xy: np.ndarray
+        arreglo de coordenadas de tamaño n x 2
+    kind: str
+        tipo de distancia (EDGE_WEIGHT_TYPE), por defecto EUC_2D
+
+    Retorno:
+    =======
+    dist: np.ndarray
+        matriz de distancias de tamaño n x n
+    """
+    xy = np.asarray(xy, dtype=np.float64)
+    dist = pairwise(xy[:, None, :], xy[None, :, :], kind)
+    np.fill_diagonal(dist, 0)
+    return np.ascontiguousarray(dist, dtype=np.float64)
+
+
+def cache_path(filename: str, kind: str) -> str:
+    """Determina el archivo de cache de la matriz de distancias de una instancia.
+
+    El nombre incluye el tipo de distancia y un hash del contenido de la
+    instancia, de modo que una instancia modificada no reutiliza una
+    matriz vieja.
+
+    Argumentos:
+    ==========
+    filename: str
+        ruta de la instancia
+    kind: str
+        tipo de distancia (EDGE_WEIGHT_TYPE)
+
+    Retorno:
+    =======
+    path: str
+        ruta del archivo ".npy", en el mismo directorio que la instancia
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    base = os.path.splitext(filename)[0]
+    return "{}.{}.{}.npy".format(base, kind, digest.hexdigest()[:16])
+
+
+def cached_matrix(filename: str, xy: np.ndarray, kind: str = 'EUC_2D') -> np.ndarray:
+    """Lee la matriz de distancias de la cache, calculandola si no existe.
+
+    La matriz se guarda con np.save junto a la instancia y se lee con
+    np.load(mmap_mode='r'): las ejecuciones siguientes no recalculan las
+    distancias y los procesos que abren el mismo archivo comparten las
+    paginas en memoria. Si la cache no puede escribirse (por ejemplo, un
+    directorio de solo lectura) se retorna la matriz calculada en memoria.
+
+    Argumentos:
+    ==========
+    filename: str
+        ruta de la instancia
+    xy: np.ndarray
+        arreglo de coordenadas de tamaño n x 2
+    kind: str
+        tipo de distancia (EDGE_WEIGHT_TYPE), por defecto EUC_2D
+
+    Retorno:
+    =======
+    dist: np.ndarray
+        matriz de distancias de tamaño n x n
+    """
+    path = cache_path(filename, kind)
+    if not os.path.exists(path):
+        dist = from_coords(xy, kind)
+        # Escribir en un archivo temporal para que otro proceso nunca lea
+        # una matriz incompleta
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp, 'wb') as f:
+                np.save(f, dist)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("No se pudo guardar la cache %s: %s", path, e)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return dist
+    return np.load(path, mmap_mode='r')
+
+
+class DistanceOracle:
+    """Clase que calcula distancias entre ciudades a demanda.
+
+    Reemplaza a la matriz de distancias cuando n es grande: se almacenan
+    solo las coordenadas (O(n) de memoria) y cada consulta aplica la
+    formula de TSPLIB correspondiente (ver pairwise). Admite la misma
+    indexacion que la matriz:
+        dist[u, v]    distancia entre dos ciudades, como float
+        dist[U, V]    distancias entre arreglos de ciudades, con broadcasting
+        dist[u]       fila de distancias desde u (tambien con un slice)
+    Las consultas de un par se guardan en una cache LRU, pues las
+    busquedas locales vuelven a evaluar una y otra vez las mismas aristas.
+    Las consultas con arreglos se evaluan de forma vectorizada.
+    """
+
+    def __init__(self, xy: np.ndarray, kind: str = 'EUC_2D',
+                 cache_size: int = 1 << 16) -> None:
+        """Construye una instancia de la clase.
+
+        Argumentos:
+        ==========
+        xy: np.ndarray
+            arreglo de coordenadas de tamaño n x 2
+        kind: str
+            tipo de distancia (EDGE_WEIGHT_TYPE), por defecto EUC_2D
+        cache_size: int
+            cantidad maxima de pares en la cache LRU
+        """
+        self.xy = np.ascontiguousarray(xy, dtype=np.float64)
+        self.kind = kind
+        self.cache_size = cache_size
+        self.n = len(self.xy)
+        self.shape = (self.n, self.n)
+        pairwise(self.xy[:1], self.xy[:1], kind)  # validar el tipo de distancia
+        self._pair = lru_cache(maxsize=cache_size)(self._compute)
+
+    def __repr__(self):
+        """Representacion del oraculo."""
+        return "<DistanceOracle {} n={}>".format(self.kind, self.n)
+
+    def __len__(self) -> int:
+        """Cantidad de ciudades."""
+        return self.n
+
+    def __getstate__(self) -> dict:
+        """Estado serializable, sin la cache (ver pickle)."""
+        state = self.__dict__.copy()
+        del state['_pair']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Reconstruye el oraculo con una cache vacia (ver pickle)."""
+        self.__dict__.update(state)
+        self._pair = lru_cache(maxsize=self.cache_size)(self._compute)
+
+    def __getitem__(self, key) -> float | np.ndarray:
+        """Distancias entre ciudades, con la indexacion de una matriz."""
+        if not isinstance(key, tuple):
+            rows = np.arange(self.n)[key]
+            return self.between(np.asarray(rows)[..., None], np.arange(self.n))
+        u, v = key
+        if isinstance(u, (int, np.integer)) and isinstance(v, (int, np.integer)):
+            # la distancia es simetrica, ambos sentidos comparten la entrada
+            return self._pair(int(u), int(v)) if u <= v else self._pair(int(v), int(u))
+        return self.between(u, v)
+
+    def between(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """Calcula de forma vectorizada las distancias entre dos arreglos de ciudades.
+
+        Argumentos:
+        ==========
+        u, v: np.ndarray
+            arreglos de ciudades compatibles para broadcasting
+
+        Retorno:
+        =======
+        dist: np.ndarray
+            distancias entre u[m] y v[m]
+        """
+        u, v = np.asarray(u), np.asarray(v)
+        dist = pairwise(self.xy[u], self.xy[v], self.kind)
+        # la diagonal vale 0, como en from_coords (GEO no da 0)
+        return np.where(u == v, 0.0, dist)
+
+    def cache_info(self):
+        """Estadisticas de la cache LRU (ver functools.lru_cache)."""
+        return self._pair.cache_info()
+
+    def _compute(self, u: int, v: int) -> float:
+        """Distancia entre dos ciudades, sin cache."""
+        if u == v:
+            return 0.0
+        return float(pairwise(self.xy[u], self.xy[v], self.kind))
+
+
+def coords_from_graph(G: Graph) -> np.ndarray | None:
+    """Recupera las coordenadas almacenadas en los nodos del grafo.
+
+    Argumentos:
+    ==========
+    G: Graph
+        grafo con los datos del problema, los nodos se enumeran de 1 a n
+
+    Retorno:
+    =======
+    xy: np.ndarray | None
+        arreglo de tamaño n x 2, o None si los nodos no tienen coordenadas
+    """
+    coords = {u: c for u, c in G.nodes(data='coord') if c is not None}
+    if len(coords) != G.number_of_nodes():
+        return None
+    return coords_array(coords)
+
+
+def nearest_neighbors(k: int,
+                      dist: np.ndarray | None = None,
+                      xy: np.ndarray | None = None,
+                      kind: str | None = 'EUC_2D') -> np.ndarray:
+    """Calcula las k ciudades mas cercanas a cada ciudad.
+
+    Si se indican las coordenadas y el tipo de distancia crece con la
+    distancia euclidea (ver EUCLIDEAN) se utiliza un arbol kd, que se
+    adapta a la densidad de las ciudades aun si estan muy agrupadas. Si no,
+    se recorren las filas de la matriz de distancias en bloques (o se
+    calculan a partir de las coordenadas con la distancia kind).
+
+    Argumentos:
+    ==========
+    k: int
+        cantidad de vecinos por ciudad
+    dist: np.ndarray | None
+        matriz de distancias de tamaño n x n
+    xy: np.ndarray | None
+        arreglo de coordenadas de tamaño n x 2
+    kind: str | None
+        tipo de distancia de las coordenadas (EDGE_WEIGHT_TYPE), None si
+        se desconoce (por defecto EUC_2D)
+
+    Retorno:
+    =======
+    neigh: np.ndarray
+        arreglo de tamaño n x k, la fila u contiene los vecinos de u
+        ordenados de mas cercano a mas lejano
+    """
+    if xy is not None and kind in EUCLIDEAN:
+        return _tree_neighbors(np.asarray(xy, dtype=np.float64), k)
+    if dist is None:
+        if xy is None or kind is None:
+            raise ValueError("Se requiere la matriz de distancias o las coordenadas y su tipo")
+        dist = DistanceOracle(xy, kind)
+    return _matrix_neighbors(dist, k)
+
+
+def _matrix_neighbors(dist: np.ndarray, k: int, block: int = 1024) -> np.ndarray:
+    """Vecinos mas cercanos a partir de las filas de la matriz de distancias."""
+    n = len(dist)
+    k = min(k, n - 1)
+    neigh = np.empty((n, k), dtype=np.int32)
+    for start in range(0, n, block):
+        rows = np.array(dist[start:start + block], dtype=np.float64)
+        idx = np.arange(len(rows))
+        rows[idx, idx + start] = np.inf  # excluir a la propia ciudad
+        part = np.argpartition(rows, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(rows, part, axis=1), axis=1)
+        neigh[start:start + block] = np.take_along_axis(part, order, axis=1)
+    return neigh
+
+
+def _tree_neighbors(xy: np.ndarray, k: int, bucket: int = NEIGHBOR_BUCKET) -> np.ndarray:
+    """Vecinos mas cercanos (en distancia euclidea) mediante un arbol kd.
+
+    Las ciudades se dividen recursivamente por la mediana de la coordenada
+    de mayor extension hasta formar cubetas de a lo sumo bucket ciudades
+    (ver _kd_tree). Para las ciudades de cada cubeta se acota la k-esima
+    distancia con las cubetas contiguas en el arbol, y luego se recorre el
+    arbol para examinar todas las cubetas cuya caja esta dentro de esa
+    cota, lo que garantiza que los vecinos son los mas cercanos. Como las
+    cubetas se adaptan a la densidad de las ciudades, cada paso compara a
+    lo sumo bucket ciudades con unas pocas cubetas, aun si las ciudades
+    estan muy agrupadas.
+    """
+    n = len(xy)
+    k = min(k, n - 1)
+    if k < 1:
+        return np.empty((n, 0), dtype=np.int32)
+    order, bounds, nodes = _kd_tree(xy, bucket)
+    leaves = [node for node in nodes if node[4] < 0]
+    nbuckets = len(bounds) - 1
+    # cubetas contiguas a cada lado: suman al menos k + 1 ciudades
+    width = -(-(k + 1) // max(int(np.diff(bounds).min()), 1))
+
+    neigh = np.empty((n, k), dtype=np.int32)
+    for b in range(nbuckets):
+        members = order[bounds[b]:bounds[b + 1]]
+        near = range(max(b - width, 0), min(b + width, nbuckets - 1) + 1)
+        d2, cand, part = _bucket_nearest(xy, members, order, bounds, near, k)
+        # toda ciudad a menos de la k-esima distancia esta en alguna de estas cubetas
+        reach = _kd_reach(nodes, leaves[b], float(np.take_along_axis(d2, part, axis=1).max()))
+        if reach[0] < near[0] or reach[-1] > near[-1]:
+            d2, cand, part = _bucket_nearest(xy, members, order, bounds, reach, k)
+        dk = np.take_along_axis(d2, part, axis=1)
+        neigh[members] = cand[np.take_along_axis(part, np.argsort(dk, axis=1), axis=1)]
+    return neigh
+
+
+def _kd_tree(xy: np.ndarray, bucket: int) -> tuple[np.ndarray, np.ndarray, list[tuple]]:
+    """Construye un arbol kd cuyas hojas son cubetas de a lo sumo bucket ciudades.
+
+    Retorno:
+    =======
+    tree: tuple[np.ndarray, np.ndarray, list[tuple]]
+        permutacion de las ciudades, limites de cada cubeta en la
+        permutacion y nodos del arbol (x0, y0, x1, y1, izquierdo, derecho),
+        donde (x0, y0) y (x1, y1) son las esquinas de la caja del nodo; en
+        las hojas izquierdo es -1 y derecho es el indice de la cubeta
+    """
+    order = np.arange(len(xy))
+    starts = []
+    nodes = []
+
+    def build(a: int, b: int) -> int:
+        pts = xy[order[a:b]]
+        (x0, y0), (x1, y1) = pts.min(axis=0).tolist(), pts.max(axis=0).tolist()
+        node = len(nodes)
+        nodes.append(None)
+        if b - a <= bucket:
+            nodes[node] = (x0, y0, x1, y1, -1, len(starts))
+            starts.append(a)
+            return node
+        # la division es por posicion, de modo que termina aun con ciudades repetidas
+        axis = 0 if x1 - x0 >= y1 - y0 else 1
+        mid = (b - a) // 2
+        order[a:b] = order[a:b][np.argpartition(pts[:, axis], mid)]
+        left = build(a, a + mid)
+        nodes[node] = (x0, y0, x1, y1, left, build(a + mid, b))
+        return node
+
+    build(0, len(xy))
+    return order, np.array(starts + [len(xy)]), nodes
+
+
+def _kd_reach(nodes: list[tuple], leaf: tuple, radius2: float) -> list[int]:
+    """Cubetas, en orden, cuya caja esta a distancia al cuadrado a lo sumo radius2 de la caja de leaf."""
+    lx0, ly0, lx1, ly1 = leaf[:4]
+    reach = []
+    pending = [0]
+    while pending:
+        x0, y0, x1, y1, left, right = nodes[pending.pop()]
+        dx = max(x0 - lx1, lx0 - x1, 0.0)
+        dy = max(y0 - ly1, ly0 - y1, 0.0)
+        if dx * dx + dy * dy > radius2:
+            continue
+        if left < 0:
+            reach.append(right)
+        else:
+            pending.append(right)
+            pending.append(left)
+    return reach
+
+
+def _bucket_nearest(xy: np.ndarray, members: np.ndarray, order: np.ndarray, bounds: np.ndarray,
+                    buckets: Iterable[int], k: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Distancias al cuadrado de members a las ciudades de buckets y posiciones de las k menores."""
+    cand = np.concatenate([order[bounds[c]:bounds[c + 1]] for c in buckets])
+    delta = xy[members, None, :] - xy[None, cand, :]
+    d2 = (delta * delta).sum(axis=-1)
+    d2[members[:, None] == cand[None, :]] = np.inf  # excluir a la propia ciudad
+    return d2, cand, np.argpartition(d2, k - 1, axis=1)[:, :k]
@@ -1,12 +1,14 @@
 import random
+import sys
 
-num_points = 1000
+# Cantidad de ciudades, por ejemplo: python gen.py 100000
+num_points = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
 x_range = (0, 10000)
 y_range = (0, 10000)
 
-with open('1000_cities.tsp', 'w') as f:
-    f.write('NAME : 1000_cities\n')
-    f.write('COMMENT : 1000-city problem (randomly generated)\n')
+with open(f'{num_points}_cities.tsp', 'w') as f:
+    f.write(f'NAME : {num_points}_cities\n')
+    f.write(f'COMMENT : {num_points}-city problem (randomly generated)\n')
     f.write('TYPE : TSP\n')
     f.write(f'DIMENSION : {num_points}\n')
     f.write('EDGE_WEIGHT_TYPE : EUC_2D\n')
@@ -1,11 +1,18 @@
 """Este modulo se encarga de la lectura de archivos ".tsp".
 
-Requiere del paquete tsplib95.
+read_coords lee directamente las coordenadas de la instancia, sin
+construir el grafo completo. read_tsp requiere del paquete tsplib95.
 """
 
 from __future__ import annotations
-from tsplib95 import load
-from networkx import Graph
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from networkx import Graph
+
+# Tipos de distancia que se pueden calcular a partir de las coordenadas
+COORD_TYPES = ('EUC_2D', 'CEIL_2D', 'ATT', 'GEO', 'MAN_2D', 'MAX_2D')
 
 
 def read_tsp(filename: str) -> tuple[Graph, dict[int, tuple[int, int]]]:
@@ -23,7 +30,56 @@ def read_tsp(filename: str) -> tuple[Graph, dict[int, tuple[int, int]]]:
     coords: dict[int, tuple[int, int]]
         diccionario con las coordenadas de cada ciudad.
     """
+    from tsplib95 import load
     problem = load(filename)
     coords = problem.node_coords
     G = problem.get_graph()
     return G, coords
+
+
+def read_coords(filename: str) -> tuple[np.ndarray, str]:
+    """Lee las coordenadas de un archivo en formato ".tsp".
+
+    Soporta instancias con NODE_COORD_SECTION y distancias EUC_2D, CEIL_2D,
+    ATT, GEO, MAN_2D o MAX_2D. El archivo se recorre una unica vez y no se
+    construye el grafo, las distancias se calculan luego con el modulo
+    distance.
+
+    Argumentos:
+    ==========
+    filename: str
+        ruta de la instancia
+
+    Retorna:
+    =======
+    coords: np.ndarray
+        arreglo de tamaño n x 2, la fila i-1 corresponde a la ciudad i
+    kind: str
+        tipo de distancia (EDGE_WEIGHT_TYPE)
+    """
+    header = {}
+    with open(filename) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('NODE_COORD_SECTION'):
+                break
+            if ':' in line:
+                key, value = line.split(':', 1)
+                header[key.strip().upper()] = value.strip()
+        else:
+            raise ValueError("{}: falta NODE_COORD_SECTION".format(filename))
+        body = f.read()
+
+    kind = header.get('EDGE_WEIGHT_TYPE', 'EUC_2D').upper()
+    if kind not in COORD_TYPES:
+        raise ValueError("{}: tipo de distancia no soportado: {}".format(filename, kind))
+
+    # Como tsplib95, se leen las ciudades presentes hasta EOF
+    tokens = body.split()
+    if 'EOF' in tokens:
+        tokens = tokens[:tokens.index('EOF')]
+    if not tokens or len(tokens) % 3 != 0:
+        raise ValueError("{}: NODE_COORD_SECTION mal formada".format(filename))
+    data = np.array(tokens, dtype=np.float64).reshape(-1, 3)
+    order = np.argsort(data[:, 0], kind='stable')
+    return np.ascontiguousarray(data[order, 1:]), kind
@@ -5,18 +5,60 @@ Fecha: 2023.
 Materia: Prog3 - TUIA
 """
 
+import os
 import parse
 import load
 import search
-import plot
 import problem
+from termination import Termination
+from progress import Trace
+from profiling import Profile, cprofile
+from bound import held_karp
 
 # Algoritmos involucrados
 HILL_CLIMBING = "hill"
 HILL_CLIMBING_RANDOM_RESET = "hill_reset"
 TABU_SEARCH = "tabu"
 HILL_CLIMBING_RANDOM_RESET_ESTOCASTICO = "hill_reset_estocastico"
-ALGO_NAMES = [HILL_CLIMBING, HILL_CLIMBING_RANDOM_RESET, HILL_CLIMBING_RANDOM_RESET_ESTOCASTICO, TABU_SEARCH]
+HILL_CLIMBING_FIRST_IMPROVEMENT = "hill_first"
+VARIABLE_NEIGHBORHOOD_DESCENT = "vnd"
+LIN_KERNIGHAN = "lk"
+SIMULATED_ANNEALING = "sa"
+GENETIC = "ga"
+ALGO_NAMES = [HILL_CLIMBING, HILL_CLIMBING_FIRST_IMPROVEMENT, HILL_CLIMBING_RANDOM_RESET,
+              HILL_CLIMBING_RANDOM_RESET_ESTOCASTICO, TABU_SEARCH, VARIABLE_NEIGHBORHOOD_DESCENT,
+              LIN_KERNIGHAN, SIMULATED_ANNEALING, GENETIC]
+
+def build_algos(workers: int | None = None,
+                seed: int | None = None) -> dict[str, search.LocalSearch]:
+    """Construye las instancias de los algoritmos, indexadas por nombre.
+
+    Argumentos:
+    ==========
+    workers: int | None
+        cantidad de procesos para los reinicios de HillClimbingReset y
+        para pulir los hijos de Genetic
+    seed: int | None
+        semilla de los reinicios en paralelo de HillClimbingReset
+    """
+    return {
+        HILL_CLIMBING: search.HillClimbing(),
+        HILL_CLIMBING_FIRST_IMPROVEMENT: search.HillClimbing(first_improvement=True),
+        VARIABLE_NEIGHBORHOOD_DESCENT: search.VariableNeighborhoodDescent(),
+        LIN_KERNIGHAN: search.LinKernighan(),
+        SIMULATED_ANNEALING: search.SimulatedAnnealing(),
+        TABU_SEARCH: search.Tabu(),
+        GENETIC: search.Genetic(workers=workers),
+        HILL_CLIMBING_RANDOM_RESET: search.HillClimbingReset(
+            max_restarts=2,
+            max_iters=20,
+            workers=workers,
+            seed=seed
+        ),
+        HILL_CLIMBING_RANDOM_RESET_ESTOCASTICO: search.HillClimbingReset(max_restarts=2, max_iters=40, rest=True,
+                                                                         workers=workers, seed=seed)
+    }
+
 
 def main() -> None:
     """Funcion principal."""
@@ -24,21 +66,27 @@ def main() -> None:
     args = parse.parse()
 
     # Leer la instancia
-    graph, coords = load.read_tsp(args.filename)
+    coords, kind = load.read_coords(args.filename)
 
     # Construir la instancia de TSP
-    p = problem.TSP(graph)
+    p = problem.TSP.from_coords(coords, kind, neighbors=args.neighbors,
+                                cache=args.filename if args.cache else None,
+                                lazy=args.lazy)
+    p.init = p.construct(args.init)
 
     # Construir las instancias de los algoritmos
-    algos = {
-        HILL_CLIMBING: search.HillClimbing(),
-        TABU_SEARCH: search.Tabu(),
-        HILL_CLIMBING_RANDOM_RESET: search.HillClimbingReset(
-            max_restarts=2,
-            max_iters=20
-        ),
-        HILL_CLIMBING_RANDOM_RESET_ESTOCASTICO: search.HillClimbingReset(max_restarts=2, max_iters=40, rest=True)
-    }
+    # En paralelo cada algoritmo ocupa un proceso, sin procesos adicionales para los reinicios
+    algos = build_algos(None if args.parallel else args.workers, seed=args.seed)
+    for algo in algos.values():
+        algo.termination = Termination(
+            time_limit=args.time_limit,
+            stagnation=args.stagnation,
+            target=-args.target if args.target is not None else None
+        )
+        if args.convergence:
+            algo.trace = Trace()
+        if args.profile:
+            algo.profile = Profile()
     # BUSQUEDA TABU PAREMATROS
     # search.Tabu(tabu_list_size=4) ar24.tsp
     # search.Tabu(tabu_list_size=4) att48.tsp
@@ -50,17 +98,68 @@ def main() -> None:
     tours = {'init': (p.init, p.obj_val(p.init))}
 
     # Resolver el TSP con cada algoritmo
-    for algo in algos.values():
-        algo.solve(p)
+    if args.cprofile is not None and not args.parallel:
+        os.makedirs(args.cprofile, exist_ok=True)
+    if args.parallel:
+        # Cada algoritmo en su propio proceso, con una copia del problema
+        search.solve_concurrent(p, algos, args.workers, args.seed)
+    else:
+        init = p.init
+        for name, algo in algos.items():
+            p.init = list(init)  # HillClimbingReset modifica el estado inicial
+            if args.cprofile is not None:
+                cprofile(os.path.join(args.cprofile, name + '.pstats'), algo.solve, p)
+            else:
+                algo.solve(p)
+        p.init = init
 
     # Mostrar resultados por linea de comandos
-    print("Valor:", "Tiempo:", "Iters:", "Algoritmo:", sep="\t\t")
-    for name, algo in algos.items():
-        print(algo.value, "%.2f" % algo.time, algo.niters, name, sep="\t\t")
+    if args.profile:
+        print("Valor:", "Tiempo:", "Iters:", "Evaluadas:", "Aplicadas:", "Copias:",
+              "Reinicios:", "Algoritmo:", sep="\t\t")
+        for name, algo in algos.items():
+            c = algo.profile.counters
+            print(algo.value, "%.2f" % algo.time, algo.niters, c['evaluated'], c['applied'],
+                  c['copies'], c['restarts'], name, sep="\t\t")
+        # Tiempo de cada fase
+        for name, algo in algos.items():
+            print()
+            print(name)
+            for phase, calls, elapsed, share in algo.profile.report(algo.time):
+                print("    %-32s %10d llamadas %9.4f s %6.1f%%"
+                      % (phase, calls, elapsed, 100 * (share or 0)))
+    else:
+        print("Valor:", "Tiempo:", "Iters:", "Algoritmo:", sep="\t\t")
+        for name, algo in algos.items():
+            print(algo.value, "%.2f" % algo.time, algo.niters, name, sep="\t\t")
+
+    if args.bound:
+        # El mejor tour encontrado acota el optimo por arriba (ver bound.held_karp)
+        values = [algo.value for algo in algos.values() if algo.value is not None]
+        lower, _ = held_karp(p, upper=-max(values) if values else None)
+        print()
+        print("Cota inferior (Held-Karp):", "%.1f" % lower)
+        print("Gap:", "Algoritmo:", sep="\t\t")
+        for name, algo in algos.items():
+            gap = "%.2f%%" % (100 * (-algo.value / lower - 1)) if algo.value is not None else "-"
+            print(gap, name, sep="\t\t")
 
     for name, algo in algos.items():
         tours[name] = (algo.tour, algo.value)
-    plot.show(graph, coords, args.filename, tours)
+    # matplotlib se importa solo al graficar (ver benchmark.py)
+    import plot
+    traces = {name: algo.trace for name, algo in algos.items()}
+    if args.export is not None:
+        # Sin ventanas, un archivo por algoritmo
+        plot.export(coords, args.filename, tours, args.export, args.format)
+        if args.convergence:
+            instance = os.path.splitext(os.path.basename(args.filename))[0]
+            plot.convergence(args.filename, traces, os.path.join(
+                args.export, "{}_convergence.{}".format(instance, args.format)))
+    else:
+        plot.show(None, coords, args.filename, tours)
+        if args.convergence:
+            plot.convergence(args.filename, traces)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,421 @@
+"""Este modulo define los vecindarios (familias de movimientos) del TSP.
+
+Cada vecindario opera sobre una copia de trabajo de un estado (tour.Tour)
+y ofrece la misma interfaz que utiliza la busqueda de primer mejora de
+search.py:
+
+* actions_from(tour, city): acciones asociadas a una ciudad.
+* delta(tour, action): diferencia de valor objetivo en O(1).
+* touched(tour, action): ciudades cuyas aristas cambian.
+* random_action(tour): una accion aleatoria, para el recocido simulado
+(solo 2opt).
+* apply(tour, action): aplica la accion in situ.
+
+Las acciones se expresan con posiciones del tour y solo son validas para
+el tour sobre el que se generaron. Si el TSP tiene listas de vecinos, o
+si se indica la opcion neighbors al construir el vecindario, las acciones
+de una ciudad se restringen a las que la acercan a sus vecinos.
+
+Vecindarios disponibles (ver NEIGHBORHOODS):
+
+* 2opt: intercambio de dos aristas (ver problem.TSP).
+* oropt: reubicacion de un segmento de hasta 3 ciudades, opcionalmente
+invertido (Or-opt).
+* swap: intercambio de dos ciudades.
+* 3opt: eliminacion de tres aristas invirtiendo los dos segmentos
+intermedios: [..., v_i] ++ [v_j, ..., v_i+1] ++ [v_k, ..., v_j+1] ++ [...].
+* lk: cadenas de movimientos 2-opt de profundidad variable, al estilo de
+Lin-Kernighan.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from problem import TSP
+    from tour import Tour
+
+
+class Neighborhood:
+    """Clase que representa un vecindario general del TSP."""
+
+    def __init__(self, problem: TSP, neighbors: int | None = None) -> None:
+        """Construye una instancia de la clase.
+
+        Argumentos:
+        ==========
+        problem: TSP
+            el problema sobre el que se definen los movimientos
+        neighbors: int | None
+            cantidad de vecinos candidatos por ciudad si el problema no
+            tiene listas de vecinos (por defecto None, todas las ciudades)
+        """
+        self.problem = problem
+        self.dist = problem.dist
+        self.n = problem.n
+        self.neighbors = problem.neighbors
+        if self.neighbors is None and neighbors is not None:
+            self.neighbors = problem.nearest(neighbors)
+
+    def candidates(self, city: int) -> Iterable[int]:
+        """Ciudades candidatas a unirse con una ciudad."""
+        if self.neighbors is not None:
+            return self.neighbors[city].tolist()
+        return range(self.n)
+
+    def actions_from(self, tour: Tour, city: int) -> Iterator[tuple]:
+        """Genera las acciones asociadas a una ciudad."""
+        raise NotImplementedError
+
+    def delta(self, tour: Tour, action: tuple) -> float:
+        """Determina la diferencia de valor objetivo al aplicar una accion."""
+        raise NotImplementedError
+
+    def touched(self, tour: Tour, action: tuple) -> list[int]:
+        """Determina las ciudades cuyas aristas cambian al aplicar una accion."""
+        raise NotImplementedError
+
+    def apply(self, tour: Tour, action: tuple) -> Tour:
+        """Aplica una accion in situ y retorna el tour."""
+        raise NotImplementedError
+
+    def random_action(self, tour: Tour) -> tuple | None:
+        """Elige una accion aleatoria, o None si no hay acciones."""
+        raise NotImplementedError
+
+
+class TwoOpt(Neighborhood):
+    """Vecindario 2-opt, el mismo que definen las acciones de TSP."""
+
+    def actions_from(self, tour: Tour, city: int) -> Iterator[tuple[int, int]]:
+        """Genera las acciones 2-opt asociadas a una ciudad."""
+        return self.problem.actions_from(tour, city, self.candidates(city))
+
+    def delta(self, tour: Tour, action: tuple[int, int]) -> float:
+        """Determina la diferencia de valor objetivo de una accion 2-opt."""
+        return self.problem.delta(tour, action)
+
+    def touched(self, tour: Tour, action: tuple[int, int]) -> list[int]:
+        """Determina las ciudades afectadas por una accion 2-opt."""
+        return self.problem.touched(tour, action)
+
+    def apply(self, tour: Tour, action: tuple[int, int]) -> Tour:
+        """Aplica una accion 2-opt in situ."""
+        return self.problem.apply(tour, action)
+
+    def random_action(self, tour: Tour) -> tuple[int, int] | None:
+        """Elige una accion 2-opt aleatoria entre las de las listas de vecinos."""
+        return self.problem.random_action(tour, self.neighbors)
+
+
+class OrOpt(Neighborhood):
+    """Vecindario Or-opt: reubicacion de segmentos cortos.
+
+    Una accion (s, L, p, rev) mueve el segmento de L ciudades que comienza
+    en la posicion s entre las posiciones p y p+1. Si rev es True el
+    segmento se inserta invertido.
+    """
+
+    def __init__(self, problem: TSP, max_len: int = 3, neighbors: int | None = None) -> None:
+        """Construye una instancia de la clase.
+
+        Argumentos:
+        ==========
+        problem: TSP
+            el problema sobre el que se definen los movimientos
+        max_len: int
+            longitud maxima de los segmentos (por defecto 3)
+        neighbors: int | None
+            ver Neighborhood
+        """
+        super().__init__(problem, neighbors)
+        self.max_len = max_len
+
+    def actions_from(self, tour: Tour, city: int) -> Iterator[tuple[int, int, int, bool]]:
+        """Genera las reubicaciones de segmentos que comienzan o terminan en city.
+
+        El segmento se inserta junto a una ciudad candidata v, antes o
+        despues de ella y en ambos sentidos. Se exige que la arista
+        (city, v) sea mas corta que lo que se ahorra al quitar el segmento
+        (ganancia parcial positiva).
+        """
+        n = self.n
+        pos = tour.pos
+        dist = self.dist
+        pc = int(pos[city])
+        for length in range(1, min(self.max_len, n - 3) + 1):
+            starts = {pc, (pc - length + 1) % n}
+            for s in starts:
+                prv, nxt = tour[s - 1], tour[s + length]
+                saving = dist[prv, tour[s]] + dist[tour[s + length - 1], nxt] - dist[prv, nxt]
+                for v in self.candidates(city):
+                    if dist[city, v] >= saving:
+                        continue
+                    pv = int(pos[v])
+                    for p in (pv, (pv - 1) % n):
+                        # p no debe pertenecer al segmento ni precederlo
+                        if (p - s) % n < length or (p - s) % n == n - 1:
+                            continue
+                        yield s, length, p, False
+                        yield s, length, p, True
+
+    def delta(self, tour: Tour, action: tuple[int, int, int, bool]) -> float:
+        """Determina la diferencia de valor objetivo de una reubicacion."""
+        s, length, p, rev = action
+        dist = self.dist
+        prv, first = tour[s - 1], tour[s]
+        last, nxt = tour[s + length - 1], tour[s + length]
+        c, d = tour[p], tour[p + 1]
+        removed = dist[prv, first] + dist[last, nxt] + dist[c, d]
+        if rev:
+            added = dist[prv, nxt] + dist[c, last] + dist[first, d]
+        else:
+            added = dist[prv, nxt] + dist[c, first] + dist[last, d]
+        return float(removed - added)
+
+    def touched(self, tour: Tour, action: tuple[int, int, int, bool]) -> list[int]:
+        """Determina las ciudades afectadas por una reubicacion."""
+        s, length, p, _ = action
+        return [tour[s - 1], tour[s], tour[s + length - 1], tour[s + length],
+                tour[p], tour[p + 1]]
+
+    def apply(self, tour: Tour, action: tuple[int, int, int, bool]) -> Tour:
+        """Aplica una reubicacion in situ.
+
+        El segmento S se intercambia con el bloque de ciudades que lo separa
+        del punto de insercion, mediante dos o tres inversiones. Se elige el
+        sentido en que ese bloque es mas corto.
+        """
+        s, length, p, rev = action
+        n = self.n
+        e = s + length - 1
+        after = (p - e) % n  # ciudades entre el segmento y la insercion
+        before = (s - 1 - p) % n  # ciudades entre la insercion y el segmento
+        if after <= before:
+            # [S][B] -> [B][S]
+            tour.reverse(s, p)
+            tour.reverse(s, s + after - 1)
+            if not rev:
+                tour.reverse(s + after, p)
+        else:
+            # [A][S] -> [S][A]
+            tour.reverse(p + 1, e)
+            tour.reverse(p + 1 + length, e)
+            if not rev:
+                tour.reverse(p + 1, p + length)
+        return tour
+
+
+class Swap(Neighborhood):
+    """Vecindario de intercambio de dos ciudades.
+
+    Una accion (p, q) intercambia las ciudades de las posiciones p y q.
+    """
+
+    def actions_from(self, tour: Tour, city: int) -> Iterator[tuple[int, int]]:
+        """Genera los intercambios que ubican a city junto a una candidata."""
+        n = self.n
+        pos = tour.pos
+        p = int(pos[city])
+        for v in self.candidates(city):
+            pv = int(pos[v])
+            for q in ((pv - 1) % n, (pv + 1) % n):
+                if q != p:
+                    yield p, q
+
+    def delta(self, tour: Tour, action: tuple[int, int]) -> float:
+        """Determina la diferencia de valor objetivo de un intercambio."""
+        p, q = action
+        n = self.n
+        dist = self.dist
+        if (p + 1) % n == q or (q + 1) % n == p:
+            if (q + 1) % n == p:
+                p, q = q, p
+            # ciudades consecutivas: [.., u, a, b, w, ..] -> [.., u, b, a, w, ..]
+            u, a, b, w = tour[p - 1], tour[p], tour[q], tour[q + 1]
+            return float(dist[u, a] + dist[b, w] - dist[u, b] - dist[a, w])
+        u1, a, w1 = tour[p - 1], tour[p], tour[p + 1]
+        u2, b, w2 = tour[q - 1], tour[q], tour[q + 1]
+        removed = dist[u1, a] + dist[a, w1] + dist[u2, b] + dist[b, w2]
+        added = dist[u1, b] + dist[b, w1] + dist[u2, a] + dist[a, w2]
+        return float(removed - added)
+
+    def touched(self, tour: Tour, action: tuple[int, int]) -> list[int]:
+        """Determina las ciudades afectadas por un intercambio."""
+        p, q = action
+        return [tour[p - 1], tour[p], tour[p + 1], tour[q - 1], tour[q], tour[q + 1]]
+
+    def apply(self, tour: Tour, action: tuple[int, int]) -> Tour:
+        """Aplica un intercambio in situ."""
+        tour.swap(*action)
+        return tour
+
+
+class ThreeOpt(Neighborhood):
+    """Vecindario 3-opt con inversion de los segmentos intermedios.
+
+    Una accion (i, j, k), con i, j, k en ese orden a lo largo del tour,
+    elimina las aristas (v_i, v_i+1), (v_j, v_j+1) y (v_k, v_k+1) y agrega
+    (v_i, v_j), (v_i+1, v_k) y (v_j+1, v_k+1).
+    """
+
+    def actions_from(self, tour: Tour, city: int) -> Iterator[tuple[int, int, int]]:
+        """Genera los movimientos 3-opt que agregan una arista desde city.
+
+        Se exige que la primer arista agregada sea mas corta que la primer
+        arista eliminada (ganancia parcial positiva), lo que acota la
+        cantidad de movimientos a O(k^2) con listas de vecinos.
+        """
+        n = self.n
+        pos = tour.pos
+        dist = self.dist
+        i = int(pos[city])
+        succ = tour[i + 1]
+        d_removed = dist[city, succ]
+        for c in self.candidates(city):
+            if dist[city, c] >= d_removed:
+                continue
+            oj = (int(pos[c]) - i) % n
+            if oj < 2:
+                continue
+            for e in self.candidates(succ):
+                ok = (int(pos[e]) - i) % n
+                if ok - oj >= 2:
+                    yield i, (i + oj) % n, (i + ok) % n
+
+    def delta(self, tour: Tour, action: tuple[int, int, int]) -> float:
+        """Determina la diferencia de valor objetivo de un movimiento 3-opt."""
+        i, j, k = action
+        dist = self.dist
+        a, b = tour[i], tour[i + 1]
+        c, d = tour[j], tour[j + 1]
+        e, f = tour[k], tour[k + 1]
+        removed = dist[a, b] + dist[c, d] + dist[e, f]
+        added = dist[a, c] + dist[b, e] + dist[d, f]
+        return float(removed - added)
+
+    def touched(self, tour: Tour, action: tuple[int, int, int]) -> list[int]:
+        """Determina las ciudades afectadas por un movimiento 3-opt."""
+        i, j, k = action
+        return [tour[i], tour[i + 1], tour[j], tour[j + 1], tour[k], tour[k + 1]]
+
+    def apply(self, tour: Tour, action: tuple[int, int, int]) -> Tour:
+        """Aplica un movimiento 3-opt in situ mediante dos inversiones."""
+        i, j, k = action
+        tour.reverse(i + 1, j)
+        tour.reverse(j + 1, k)
+        return tour
+
+
+class LinKernighan(Neighborhood):
+    """Vecindario de movimientos de profundidad variable (Lin-Kernighan).
+
+    Una accion es una cadena de movimientos 2-opt ((t1, t2, t3, t4), ...)
+    con la misma ciudad t1: cada uno elimina las aristas {t1, t2} y
+    {t3, t4} y agrega {t2, t3} y {t4, t1}; la arista {t4, t1} es la que
+    se elimina en el siguiente movimiento de la cadena.
+
+    La cadena se construye de forma golosa mientras la ganancia parcial
+    sea positiva, sin volver a agregar aristas eliminadas ni eliminar
+    aristas agregadas, y se conserva el prefijo con mayor ganancia.
+    """
+
+    def __init__(self, problem: TSP, max_depth: int = 10, neighbors: int = 10) -> None:
+        """Construye una instancia de la clase.
+
+        Argumentos:
+        ==========
+        problem: TSP
+            el problema sobre el que se definen los movimientos
+        max_depth: int
+            longitud maxima de las cadenas (por defecto 10)
+        neighbors: int
+            cantidad de vecinos candidatos por ciudad si el problema no
+            tiene listas de vecinos (por defecto 10)
+        """
+        super().__init__(problem, neighbors)
+        self.max_depth = max_depth
+
+    def candidates(self, city: int) -> list[int]:
+        """Ciudades candidatas, ordenadas de mas cercana a mas lejana."""
+        return self.neighbors[city].tolist()
+
+    def actions_from(self, tour: Tour, t1: int) -> Iterator[tuple[tuple[int, int, int, int], ...]]:
+        """Genera la mejor cadena que mejora el tour partiendo de t1.
+
+        La cadena se busca aplicando los movimientos de forma tentativa;
+        el tour se restaura antes de retornarla.
+        """
+        for t2 in (tour.next(t1), tour.prev(t1)):
+            chain, gain = self._search(tour, t1, t2)
+            if gain > 0:
+                yield chain
+                return
+
+    def _search(self, tour: Tour, t1: int, t2: int) -> tuple[tuple, float]:
+        """Construye una cadena desde la arista {t1, t2}.
+
+        Retorna el prefijo de la cadena con mayor ganancia y esa ganancia.
+        """
+        dist = self.dist
+        g = dist[t1, t2]  # ganancia acumulada sin cerrar el tour
+        removed = {frozenset((t1, t2))}
+        added = set()
+        chain = []
+        best_gain, best_len = 0.0, 0
+        for _ in range(self.max_depth):
+            forward = tour.next(t1) == t2
+            best_val, best_t3, best_t4 = 0.0, None, None
+            for t3 in self.candidates(t2):
+                g1 = g - dist[t2, t3]
+                if g1 <= 0:
+                    break
+                t4 = tour.prev(t3) if forward else tour.next(t3)
+                if t3 == t1 or t4 == t2 or t4 == t1:
+                    continue
+                if frozenset((t2, t3)) in removed or frozenset((t3, t4)) in added:
+                    continue
+                val = g1 + dist[t3, t4]
+                if val > best_val:
+                    best_val, best_t3, best_t4 = val, t3, t4
+            if best_t3 is None:
+                break
+            tour.exchange(t1, t2, best_t3, best_t4)
+            chain.append((t1, t2, best_t3, best_t4))
+            removed.add(frozenset((best_t3, best_t4)))
+            added.add(frozenset((t2, best_t3)))
+            g = best_val
+            closing = g - dist[best_t4, t1]
+            if closing > best_gain:
+                best_gain, best_len = closing, len(chain)
+            t2 = best_t4
+        # Restaurar el tour
+        for a, b, c, d in reversed(chain):
+            tour.exchange(a, d, b, c)
+        return tuple(chain[:best_len]), float(best_gain)
+
+    def delta(self, tour: Tour, action: tuple[tuple[int, int, int, int], ...]) -> float:
+        """Determina la diferencia de valor objetivo de una cadena."""
+        dist = self.dist
+        return float(sum(dist[t1, t2] + dist[t3, t4] - dist[t2, t3] - dist[t4, t1]
+                         for t1, t2, t3, t4 in action))
+
+    def touched(self, tour: Tour, action: tuple[tuple[int, int, int, int], ...]) -> list[int]:
+        """Determina las ciudades afectadas por una cadena."""
+        return list({city for move in action for city in move})
+
+    def apply(self, tour: Tour, action: tuple[tuple[int, int, int, int], ...]) -> Tour:
+        """Aplica una cadena in situ."""
+        for t1, t2, t3, t4 in action:
+            tour.exchange(t1, t2, t3, t4)
+        return tour
+
+
+# Vecindarios disponibles por nombre
+NEIGHBORHOODS = {
+    '2opt': TwoOpt,
+    'oropt': OrOpt,
+    'swap': Swap,
+    '3opt': ThreeOpt,
+    'lk': LinKernighan,
+}
@@ -2,6 +2,11 @@
 
 Node representa un nodo para una busqueda local, es decir,
 almacena un estado su un valor objetivo.
+
+Los algoritmos solo construyen nodos para los movimientos aceptados: los
+sucesores candidatos se evaluan como arreglos de acciones y diferencias
+de valor objetivo (ver OptProblem.move_gains), sin copiar estados. Los
+nodos no tienen __dict__, solo los atributos state y value.
 """
 from typing import TypeVar
 
@@ -11,6 +16,9 @@ Action = TypeVar('Action')
 
 class Node:
     """Clase que representa un nodo para busqueda local."""
+
+    __slots__ = ('state', 'value')
+
     def __init__(self, state: State, value: float) -> None:
         """Construye una instancia de la clase.
 
@@ -20,4 +20,153 @@ def parse() -> ArgumentParser:
                         metavar='filename.tsp',
                         help='path to input file')
 
+    # Agregamos los argumentos opcionales
+    parser.add_argument('-i', '--init',
+                        default='identity',
+                        choices=['identity', 'random', 'nn', 'greedy',
+                                 'christofides', 'hilbert'],
+                        help='heuristic used to build the initial tour \
+                              (default: identity)')
+    parser.add_argument('-k', '--neighbors',
+                        type=int,
+                        default=None,
+                        metavar='K',
+                        help='restrict 2-opt moves to the K nearest \
+                              neighbors of each city')
+    parser.add_argument('-j', '--workers',
+                        type=int,
+                        default=None,
+                        help='number of processes used to run the restarts \
+                              of random restart hill climbing, or the \
+                              algorithms with --parallel')
+    parser.add_argument('-P', '--parallel',
+                        action='store_true',
+                        help='run every algorithm at the same time, each one \
+                              in its own process')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='seed of the random choices of the algorithms \
+                              when running in parallel, and of the restarts \
+                              spread over processes with -j (default: 0)')
+    parser.add_argument('--no-cache',
+                        dest='cache',
+                        action='store_false',
+                        help='do not store or reuse the distance matrix \
+                              cached next to the instance file')
+    parser.add_argument('--lazy',
+                        action='store_true',
+                        help='compute distances on demand instead of \
+                              building the distance matrix (large instances)')
+    parser.add_argument('-t', '--time-limit',
+                        type=float,
+                        default=None,
+                        metavar='SECONDS',
+                        help='stop each algorithm after SECONDS seconds')
+    parser.add_argument('--stagnation',
+                        type=int,
+                        default=None,
+                        metavar='ITERS',
+                        help='stop each algorithm after ITERS iterations \
+                              without improving its best tour')
+    parser.add_argument('--target',
+                        type=float,
+                        default=None,
+                        metavar='LENGTH',
+                        help='stop each algorithm once it finds a tour of \
+                              length at most LENGTH')
+    parser.add_argument('--profile',
+                        action='store_true',
+                        help='measure the time of each phase of the \
+                              algorithms and count evaluated and applied moves')
+    parser.add_argument('--cprofile',
+                        default=None,
+                        metavar='DIR',
+                        help='run each algorithm under cProfile and write \
+                              DIR/<algorithm>.pstats (ignored with --parallel)')
+    parser.add_argument('-e', '--export',
+                        default=None,
+                        metavar='DIR',
+                        help='save the tour of each algorithm to \
+                              DIR/<instance>_<algorithm>.<format> instead of \
+                              showing the plots')
+    parser.add_argument('-f', '--format',
+                        default='png',
+                        choices=['png', 'svg'],
+                        help='image format used by --export (default: png)')
+    parser.add_argument('--bound',
+                        action='store_true',
+                        help='compute the Held-Karp lower bound of the \
+                              instance and report the gap of each algorithm')
+    parser.add_argument('--convergence',
+                        action='store_true',
+                        help='record the improvements of each algorithm and \
+                              plot their convergence curves')
+
+    return parser.parse_args()
+
+
+def parse_benchmark() -> ArgumentParser:
+    """Parsea la linea de comandos de benchmark.py.
+
+    Utiliza el paquete de python argparse.
+    """
+    parser = ArgumentParser(
+        prog='tsp-benchmark',
+        description='This program runs every local search algorithm over a \
+                     set of TSP instances and records its performance.',
+    )
+
+    parser.add_argument('instances',
+                        nargs='*',
+                        metavar='filename.tsp',
+                        help='instances to run (default: every .tsp file in \
+                              the instances directory)')
+    parser.add_argument('-a', '--algos',
+                        nargs='+',
+                        default=None,
+                        metavar='ALGO',
+                        help='algorithms to run (default: all)')
+    parser.add_argument('-s', '--seeds',
+                        type=int,
+                        default=3,
+                        help='number of seeds per instance and algorithm \
+                              (default: 3)')
+    parser.add_argument('-i', '--init',
+                        default='identity',
+                        choices=['identity', 'random', 'nn', 'greedy',
+                                 'christofides', 'hilbert'],
+                        help='heuristic used to build the initial tour \
+                              (default: identity)')
+    parser.add_argument('-k', '--neighbors',
+                        type=int,
+                        default=None,
+                        metavar='K',
+                        help='restrict 2-opt moves to the K nearest \
+                              neighbors of each city')
+    parser.add_argument('-j', '--workers',
+                        type=int,
+                        default=None,
+                        help='number of processes used to run the restarts \
+                              of random restart hill climbing')
+    parser.add_argument('--no-bound',
+                        dest='bound',
+                        action='store_false',
+                        help='do not compute the Held-Karp lower bound of \
+                              each instance')
+    parser.add_argument('-o', '--output',
+                        default='benchmark',
+                        metavar='PREFIX',
+                        help='write the runs to PREFIX.csv and the summary \
+                              to PREFIX.json (default: benchmark)')
+    parser.add_argument('-b', '--baseline',
+                        default=None,
+                        metavar='baseline.json',
+                        help='summary of a previous run to compare against')
+    parser.add_argument('-t', '--tolerance',
+                        type=float,
+                        default=0.1,
+                        help='relative slowdown or loss of quality reported \
+                              as a regression (default: 0.1)')
+
     return parser.parse_args()
@@ -1,32 +1,62 @@
 """Este modulo se encarga de graficar los tours.
 
-Requiere del paquete matplotlib.
+Requiere del paquete matplotlib, y show tambien del paquete networkx.
+
+* show: grafica los tours en una ventana.
+
+* export: guarda un archivo de imagen por algoritmo, sin ventanas. Dibuja
+cada tour como una unica LineCollection construida a partir del arreglo de
+coordenadas, sin pasar por el grafo, por lo que sirve para instancias de
+miles de ciudades y en servidores sin pantalla.
 """
 
 from __future__ import annotations
+from typing import TYPE_CHECKING
+import os
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
-import networkx as nx
+import numpy as np
 
+if TYPE_CHECKING:
+    from networkx import Graph
+    from progress import Trace
 
-def show(G: nx.Graph,
-         coords: dict[int, tuple[float, float]],
+
+def show(G: Graph | None,
+         coords: dict[int, tuple[float, float]] | np.ndarray,
          name: str,
          sols: dict[str, tuple[list[int]], float]) -> None:
     """Grafica un conjunto de tours.
 
     Argumentos:
     ==========
-    G: nx.Graph
-        grafo que representa la instancia del TSP
-    coords: dict[int, tuple[float, float]]
-        diccionario con las coordenadas de cada ciudad
+    G: Graph | None
+        grafo que representa la instancia del TSP, si es None se construye
+        un grafo solo con las ciudades
+    coords: dict[int, tuple[float, float]] | np.ndarray
+        diccionario con las coordenadas de cada ciudad, o arreglo n x 2
+        como el que retorna load.read_coords
     name: str
         nombre de la instancia
     sols: dict[str, tuple[list[int]], float]
-        diccionario con el tour y su costo para cada algoritmo de busqueda
+        diccionario con el tour y su costo para cada algoritmo de busqueda,
+        se omiten los algoritmos sin tour (tour None, por ejemplo si fallaron)
     """
+    import networkx as nx  # solo show dibuja con el grafo
+
+    sols = {algo: sol for algo, sol in sols.items() if sol[0] is not None}
+    if not sols:
+        return
+    if isinstance(coords, np.ndarray):
+        coords = {i + 1: tuple(xy) for i, xy in enumerate(coords.tolist())}
+    if G is None:
+        G = nx.Graph()
+        G.add_nodes_from(coords)
+
     # Crear los subplots
-    fig, axs = plt.subplots(nrows=1, ncols=len(sols))
+    fig, axs = plt.subplots(nrows=1, ncols=len(sols), squeeze=False)
+    axs = axs[0]
 
     # Determinar colores
     colors = plt.rcParams["axes.prop_cycle"]()
@@ -53,3 +83,101 @@ def show(G: nx.Graph,
     fig.suptitle(name, fontsize=15)
     plt.subplots_adjust(hspace=0.5)
     plt.show()
+
+
+def export(coords: dict[int, tuple[float, float]] | np.ndarray,
+           name: str,
+           sols: dict[str, tuple[list[int]], float],
+           directory: str,
+           fmt: str = 'png') -> list[str]:
+    """Guarda un archivo de imagen con el tour de cada algoritmo.
+
+    Las figuras se construyen con matplotlib.figure.Figure, sin pyplot,
+    de modo que no se abre ninguna ventana ni se acumulan figuras.
+
+    Argumentos:
+    ==========
+    coords: dict[int, tuple[float, float]] | np.ndarray
+        coordenadas de cada ciudad (ver show)
+    name: str
+        nombre de la instancia
+    sols: dict[str, tuple[list[int]], float]
+        diccionario con el tour y su costo para cada algoritmo de busqueda,
+        se omiten los algoritmos sin tour (ver show)
+    directory: str
+        directorio donde se guardan las imagenes
+    fmt: str
+        formato de las imagenes, 'png' o 'svg' (por defecto 'png')
+
+    Retorno:
+    =======
+    paths: list[str]
+        rutas de los archivos generados, DIRECTORY/INSTANCIA_ALGORITMO.FMT
+    """
+    if not isinstance(coords, np.ndarray):
+        coords = np.array([coords[i] for i in sorted(coords)])
+    coords = np.asarray(coords, dtype=float)
+    instance = os.path.splitext(os.path.basename(name))[0]
+    os.makedirs(directory, exist_ok=True)
+    colors = plt.rcParams["axes.prop_cycle"]()
+    # Tamaño de los nodos decreciente con la cantidad de ciudades
+    size = max(0.5, 4.0 / np.sqrt(max(1, len(coords) / 100)))
+
+    paths = []
+    for algo, (tour, val) in sols.items():
+        if tour is None:
+            continue
+        fig = Figure(figsize=(8, 8))
+        ax = fig.add_subplot()
+
+        # Segmentos (ciudad, siguiente ciudad) del tour cerrado
+        order = np.asarray(tour, dtype=np.intp)
+        if len(order) and order[0] != order[-1]:
+            order = np.append(order, order[0])
+        xy = coords[order]
+        segments = np.stack((xy[:-1], xy[1:]), axis=1)
+        ax.add_collection(LineCollection(segments, linewidths=0.8,
+                                         colors=next(colors)["color"],
+                                         label="{}: {}".format(algo, val)))
+
+        # Dibujar los nodos
+        ax.plot(coords[:, 0], coords[:, 1], linestyle='none', marker='o',
+                markersize=size, color="black")
+
+        ax.autoscale_view()
+        ax.set_aspect('equal', adjustable='datalim')
+        ax.legend(loc='upper right')
+        ax.set_title(instance)
+        path = os.path.join(directory, "{}_{}.{}".format(instance, algo, fmt))
+        fig.savefig(path, format=fmt)
+        paths.append(path)
+    return paths
+
+
+def convergence(name: str, traces: dict[str, Trace], path: str | None = None) -> None:
+    """Grafica las curvas de convergencia de un conjunto de algoritmos.
+
+    Argumentos:
+    ==========
+    name: str
+        nombre de la instancia
+    traces: dict[str, Trace]
+        diccionario con la traza de mejoras de cada algoritmo de busqueda
+        (ver progress.Trace)
+    path: str | None
+        si no es None, se guarda la grafica en path en lugar de mostrarla
+    """
+    fig = Figure() if path is not None else plt.figure()
+    ax = fig.add_subplot()
+    for algo, trace in traces.items():
+        if len(trace):
+            # El valor objetivo es el opuesto de la longitud del tour
+            ax.step(trace.times, -trace.values, where='post', label=algo)
+    ax.set_xlabel("tiempo (s)")
+    ax.set_ylabel("longitud del mejor tour")
+    ax.legend()
+    fig.suptitle(name, fontsize=15)
+    if path is not None:
+        fig.savefig(path)
+    else:
+        plt.show()
@@ -13,7 +13,8 @@ Formulacion de estado completo para el Problema del Viajante:
 
 * Estado inicial.
     Consideramos el estado inicial [0,1,2,...,n,0].
-    Pero cualquier estado puede ser inicial.
+    Pero cualquier estado puede ser inicial, por ejemplo uno construido
+    con una heuristica constructiva (ver TSP.construct).
 
 * Acciones.
     Consideramos como accion el intercambio de dos aristas del tour.
@@ -37,9 +38,24 @@ Formulacion de estado completo para el Problema del Viajante:
 """
 
 from __future__ import annotations
-from typing import TypeVar
-from networkx import Graph
-from random import shuffle
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, TypeVar
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from random import choice, getrandbits, randrange, shuffle
+import numpy as np
+import distance
+from construct import CONSTRUCTIONS
+from tour import EvaluatedTour, Tour
+from neighborhoods import NEIGHBORHOODS, Neighborhood
+
+if TYPE_CHECKING:
+    from networkx import Graph
+
+# Vecinos candidatos por defecto cuando las distancias se calculan a demanda
+LAZY_NEIGHBORS = 10
+
+# Sorteos entre las listas de vecinos tras los que random_action elige entre todas las acciones
+MAX_LOCAL_ATTEMPTS = 100
 
 State = TypeVar('State')
 Action = TypeVar('Action')
@@ -64,6 +80,15 @@ class OptProblem:
         """Determina el valor objetivo de un estado."""
         raise NotImplementedError
 
+    def obj_vals(self, states: np.ndarray) -> np.ndarray:
+        """Determina el valor objetivo de un conjunto de estados.
+
+        Recibe un arreglo con un estado por fila (ver search.Genetic). Por
+        defecto evalua cada estado por separado, las subclases pueden
+        redefinirlo de forma vectorizada.
+        """
+        return np.array([self.obj_val(state.tolist()) for state in states], dtype=float)
+
     def val_diff(self, state: State) -> dict[Action, float]:
         """Determina la diferencia de valor objetivo al aplicar cada accion.
 
@@ -72,23 +97,232 @@ class OptProblem:
         """
         raise NotImplementedError
 
+    def best_action(self, state: State) -> tuple[Action | None, float]:
+        """Determina la accion con mayor diferencia de valor objetivo.
+
+        Los empates se resuelven de forma aleatoria. Por defecto se construye
+        a partir de self.val_diff(state), las subclases pueden redefinirlo
+        con una implementacion mas eficiente.
+
+        Retorno:
+        =======
+        act: Action | None
+            la mejor accion, o None si no hay acciones
+        diff: float
+            diferencia de valor objetivo al aplicar act
+        """
+        diff = self.val_diff(state)
+        if not diff:
+            return None, 0.0
+        best = max(diff.values())
+        act = choice([a for a, val in diff.items() if val == best])
+        return act, best
+
+    def delta(self, state: State, action: Action) -> float:
+        """Determina la diferencia de valor objetivo al aplicar una accion.
+
+        Por defecto genera el estado sucesor, las subclases pueden redefinirlo
+        con un calculo incremental.
+        """
+        return self.obj_val(self.result(state, action)) - self.obj_val(state)
+
+    def random_action(self, state: State) -> Action:
+        """Elige una accion aleatoria de self.actions(state).
+
+        Retorna None si no hay acciones. Por defecto construye la lista de
+        acciones, las subclases pueden redefinirlo para elegirla sin
+        enumerarlas.
+        """
+        acts = self.actions(state)
+        return choice(acts) if acts else None
+
+    def sample_gains(self, state: State, k: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Elige k acciones aleatorias y determina sus diferencias de valor objetivo.
+
+        Las acciones se eligen con reemplazo como en self.random_action y
+        se retornan como en self.move_gains, en arreglos (i, j, diff). Por
+        defecto se elige y evalua cada accion por separado, las subclases
+        pueden redefinirlo de forma vectorizada.
+        """
+        acts = [self.random_action(state) for _ in range(k)]
+        acts = [a for a in acts if a is not None]
+        i, j = np.array(acts, dtype=np.intp).reshape(-1, 2).T
+        diff = np.array([self.delta(state, a) for a in acts], dtype=float)
+        return i, j, diff
+
+    def keys(self, state: State) -> list:
+        """Determina los elementos del estado que organizan la busqueda.
+
+        Cada elemento tiene asociado un bit "don't-look": solo se examinan
+        las acciones de los elementos afectados por el ultimo movimiento.
+        """
+        raise NotImplementedError
+
+    def actions_from(self, state: State, key) -> Iterator[Action]:
+        """Determina las acciones asociadas a un elemento del estado."""
+        raise NotImplementedError
+
+    def touched(self, state: State, action: Action) -> list:
+        """Determina los elementos afectados al aplicar una accion."""
+        raise NotImplementedError
+
+    def move_gains(self, state: State) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Determina las acciones y sus diferencias de valor objetivo.
+
+        Es una version vectorizada de self.val_diff para acciones que son
+        pares de enteros: retorna arreglos (i, j, diff) con una posicion
+        por cada accion (i[m], j[m]). El arreglo diff es nuevo en cada
+        llamada, por lo que puede modificarse in situ.
+        """
+        raise NotImplementedError
+
+    def added_pairs(self, state: State, i: np.ndarray,
+                    j: np.ndarray) -> tuple[np.ndarray, ...]:
+        """Determina los pares de elementos que une cada accion.
+
+        Retorna arreglos (u1, v1, u2, v2): la accion (i[m], j[m]) une los
+        pares (u1[m], v1[m]) y (u2[m], v2[m]).
+        """
+        raise NotImplementedError
+
+    def removed_pairs(self, state: State, action: Action) -> list[tuple[int, int]]:
+        """Determina los pares de elementos que separa una accion."""
+        raise NotImplementedError
+
+    def neighborhood(self, name: str, **options):
+        """Construye un vecindario del problema a partir de su nombre.
+
+        Un vecindario ofrece actions_from, delta, touched y apply, con la
+        misma semantica que los metodos homonimos de OptProblem.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def shared(self) -> Iterator[tuple[Callable[..., OptProblem], tuple]]:
+        """Prepara el problema para ser utilizado desde otros procesos.
+
+        Produce un par (factory, args) serializable con pickle tal que
+        factory(*args) reconstruye el problema en otro proceso. Por defecto
+        se envia una copia del problema; las subclases pueden compartir sus
+        datos sin copiarlos. Los datos compartidos se liberan al salir
+        del bloque with.
+        """
+        yield _identity, (self,)
+
+    def encode(self, state: State, evaluated: bool = False) -> State:
+        """Construye una copia de trabajo del estado, apta para self.apply.
+
+        Con evaluated=True la copia conserva su valor objetivo en cada
+        movimiento, si el problema lo admite (ver TSP.encode). Solo conviene
+        a quien evalua la copia de trabajo: los algoritmos que acumulan las
+        diferencias de valor objetivo no lo necesitan.
+        """
+        return state
+
+    def decode(self, state: State) -> State:
+        """Recupera el estado a partir de una copia de trabajo."""
+        return state
+
+    def apply(self, state: State, action: Action) -> State:
+        """Aplica una accion a una copia de trabajo del estado.
+
+        A diferencia de self.result, puede modificar el estado in situ,
+        por lo que siempre debe utilizarse el estado retornado.
+        """
+        return self.result(state, action)
+
 
 class TSP(OptProblem):
     """Subclase que representa al Problema del Viajante (TSP).
     Un estado es una lista de enteros: list[int].
     Una accion es un par de enteros: tuple[int,int].
+    Durante la busqueda los estados pueden representarse con la clase
+    tour.Tour (ver self.encode), que admite aplicar acciones in situ.
+    Las distancias se almacenan en una matriz densa self.dist, donde
+    self.dist[u][v] es la distancia entre las ciudades u y v (de 0 a n-1).
+    En instancias grandes self.dist puede ser un distance.DistanceOracle,
+    que calcula las distancias a demanda con la misma indexacion.
     """
 
-    def __init__(self, G: Graph) -> None:
+    def __init__(self, G: Graph | None = None,
+                 dist: np.ndarray | None = None,
+                 coords: np.ndarray | None = None,
+                 neighbors: int | None = None,
+                 kind: str | None = None) -> None:
         """Construye una instancia de TSP.
         Argumentos:
         ==========
         G: Graph grafo con los datos del problema los nodos del grafo se enumeran de 1 a n, ¡cuidado!
+        dist: np.ndarray | DistanceOracle matriz de distancias n x n, si se
+            indica no se utiliza el grafo
+        coords: np.ndarray coordenadas n x 2 de las ciudades (opcional)
+        neighbors: int cantidad de vecinos candidatos por ciudad, si se indica
+            las acciones se restringen a las que agregan una arista entre
+            ciudades cercanas (por defecto None, todas las acciones; con un
+            DistanceOracle, LAZY_NEIGHBORS vecinos)
+        kind: str tipo de distancia de las coordenadas (EDGE_WEIGHT_TYPE), por defecto None:
+            se desconoce y las listas de vecinos se calculan con la matriz de distancias
         """
-        self.G = G
-        self.init = [i for i in range(0, G.number_of_nodes())]
+        if dist is None:
+            dist = distance.from_graph(G)
+        # archivo de la matriz si es una memoria mapeada (ver distance.cached_matrix)
+        self._dist_file = getattr(dist, 'filename', None)
+        if coords is None and G is not None:
+            coords = distance.coords_from_graph(G)
+        if isinstance(dist, distance.DistanceOracle):
+            # sin matriz no es posible recorrer las O(n^2) acciones
+            if neighbors is None:
+                neighbors = LAZY_NEIGHBORS
+            if coords is None:
+                coords = dist.xy
+            if kind is None:
+                kind = dist.kind
+            self.dist = dist
+        else:
+            self.dist = np.ascontiguousarray(dist, dtype=np.float64)
+        self.n = len(self.dist)
+        self.coords = coords
+        self.kind = kind
+        self._invalid = None  # mascara de acciones invalidas (ver gain_matrix)
+        self._pairs = None  # todas las acciones validas (ver move_gains)
+        self.neighbors = None  # listas de vecinos candidatos (n x k)
+        self._nearest = {}  # listas de vecinos calculadas a pedido (ver nearest)
+        if neighbors is not None:
+            self.neighbors = distance.nearest_neighbors(neighbors, self.dist, coords, kind)
+        self.init = [i for i in range(0, self.n)]
         self.init.append(0)
 
+    @classmethod
+    def from_coords(cls, coords: dict[int, tuple[float, float]] | np.ndarray,
+                    kind: str = 'EUC_2D', neighbors: int | None = None,
+                    cache: str | None = None, lazy: bool = False) -> TSP:
+        """Construye una instancia de TSP a partir de las coordenadas.
+
+        Argumentos:
+        ==========
+        coords: dict[int, tuple[float, float]] | np.ndarray
+            coordenadas de cada ciudad, como las retorna load.read_tsp
+        kind: str
+            tipo de distancia (EDGE_WEIGHT_TYPE), por defecto EUC_2D
+        neighbors: int | None
+            cantidad de vecinos candidatos por ciudad (ver __init__)
+        cache: str | None
+            ruta de la instancia, si se indica la matriz de distancias se
+            lee de la cache en disco (ver distance.cached_matrix)
+        lazy: bool
+            si es True no se construye la matriz de distancias, se calculan
+            a demanda (ver distance.DistanceOracle)
+        """
+        if isinstance(coords, dict):
+            coords = distance.coords_array(coords)
+        if lazy:
+            dist = distance.DistanceOracle(coords, kind)
+        elif cache is not None:
+            dist = distance.cached_matrix(cache, coords, kind)
+        else:
+            dist = distance.from_coords(coords, kind)
+        return cls(dist=dist, coords=coords, neighbors=neighbors, kind=kind)
+
     def actions(self, state: list[int]) -> list[tuple[int, int]]:
         """Determina la lista de acciones que se pueden aplicar a un estado.
 
@@ -100,10 +334,13 @@ class TSP(OptProblem):
         act: list[tuple[int, int]]
             lista de acciones
         """
+        if self.neighbors is not None:
+            i, j = self.candidates(state)
+            return list(zip(i.tolist(), j.tolist()))
         act = []
-        for i in range(0, self.G.number_of_nodes() - 2):
-            for j in range(i + 2, self.G.number_of_nodes()):
-                if (j + 1) % self.G.number_of_nodes() != i:
+        for i in range(0, self.n - 2):
+            for j in range(i + 2, self.n):
+                if (j + 1) % self.n != i:
                     act.append((i, j))
         return act
 
@@ -122,6 +359,10 @@ class TSP(OptProblem):
         succ: list[int]
             estado sucesor
         """
+        if isinstance(state, Tour):
+            succ = state.copy()
+            succ.two_opt(*action)
+            return succ
         succ = list(state)  # copy of the current state
         i, j = action
         succ[i + 1: j+1] = state[i + 1: j+1][::-1]  # reverse
@@ -136,12 +377,29 @@ class TSP(OptProblem):
         =======
         value: float valor objetivo
         """
-        value = 0
-        for i in range(0, self.G.number_of_nodes()):
-            u = state[i]+1  # origen
-            v = state[i+1]+1  # destino
-            value -= self.G.get_edge_data(u, v)['weight']
-        return value
+        if isinstance(state, EvaluatedTour):
+            return -state.length  # la longitud se mantiene en cada movimiento
+        tour = np.asarray(state)
+        return -float(self.dist[tour[:-1], tour[1:]].sum())
+
+    def obj_vals(self, states: np.ndarray) -> np.ndarray:
+        """Determina el valor objetivo de un conjunto de estados.
+
+        Se suman las aristas de todos los tours a la vez, con una unica
+        lectura de la matriz de distancias.
+
+        Argumentos:
+        ==========
+        states: np.ndarray
+            arreglo de P x (n + 1) con un estado [0, ..., 0] por fila
+
+        Retorno:
+        =======
+        values: np.ndarray
+            valor objetivo de cada estado
+        """
+        states = np.asarray(states)
+        return -self.dist[states[:, :-1], states[:, 1:]].sum(axis=1)
 
     def val_diff(self, state: list[int]) -> dict[tuple[int, int], float]:
         """Determina la diferencia de valor objetivo al aplicar cada accion.
@@ -163,23 +421,493 @@ class TSP(OptProblem):
         diff: dict[tuple[int, int], float]
             diccionario con las diferencias de valor objetivo
         """
-        diff = {}
-        for a in self.actions(state):
-            i, j = a
-            v1 = state[i]+1  # origen de i
-            v2 = state[i+1]+1  # destino de i
-            v3 = state[j]+1  # origen de j
-            v4 = state[j+1]+1  # destino de j
-            distl1l2 = self.G.get_edge_data(v1, v2)['weight']
-            distl3l4 = self.G.get_edge_data(v3, v4)['weight']
-            distl1l3 = self.G.get_edge_data(v1, v3)['weight']
-            distl2l4 = self.G.get_edge_data(v2, v4)['weight']
-            diff[a] = distl1l2 + distl3l4 - distl1l3 - distl2l4
-        return diff
+        acts = self.actions(state)
+        if not acts:
+            return {}
+        i, j = np.array(acts).T
+        gain = self.gains(state, i, j)
+        return dict(zip(acts, gain.tolist()))
+
+    def candidates(self, state: list[int]) -> tuple[np.ndarray, np.ndarray]:
+        """Determina las acciones candidatas a partir de las listas de vecinos.
+
+        Para cada ciudad u y cada vecino v de u se consideran las dos
+        acciones 2-opt que agregan la arista (u, v): la que la une con el
+        sucesor de u y la que la une con el predecesor de u. En total se
+        generan O(n k) acciones en lugar de O(n^2).
+
+        Argumentos:
+        ==========
+        state: list[int]
+            un estado
+
+        Retorno:
+        =======
+        i, j: tuple[np.ndarray, np.ndarray]
+            arreglos con las acciones (i[m], j[m]) sin repeticiones
+        """
+        n = self.n
+        tour = np.asarray(state)[:-1]
+        pos = np.empty(n, dtype=np.int64)
+        pos[tour] = np.arange(n)
+        k = self.neighbors.shape[1]
+        p = np.repeat(np.arange(n), k)  # posicion de u
+        q = pos[self.neighbors[tour].ravel()]  # posicion de cada vecino v
+        a = np.concatenate((p, (p - 1) % n))
+        b = np.concatenate((q, (q - 1) % n))
+        i, j = np.minimum(a, b), np.maximum(a, b)
+        valid = (j - i >= 2) & ~((i == 0) & (j == n - 1))
+        key = np.unique(i[valid] * n + j[valid])
+        return key // n, key % n
+
+    def gains(self, state: list[int], i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Calcula la diferencia de valor objetivo de un conjunto de acciones.
+
+        Argumentos:
+        ==========
+        state: list[int]
+            un estado
+        i, j: np.ndarray
+            arreglos con las acciones (i[m], j[m])
+
+        Retorno:
+        =======
+        gain: np.ndarray
+            diferencia de valor objetivo de cada accion
+        """
+        tour = np.asarray(state)
+        v1 = tour[i]  # origen de i
+        v2 = tour[i + 1]  # destino de i
+        v3 = tour[j]  # origen de j
+        v4 = tour[j + 1]  # destino de j
+        dist = self.dist
+        return dist[v1, v2] + dist[v3, v4] - dist[v1, v3] - dist[v2, v4]
+
+    def move_gains(self, state: list[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Determina las acciones y sus diferencias de valor objetivo.
+
+        Version vectorizada de self.val_diff(state) que no construye tuplas.
+
+        Argumentos:
+        ==========
+        state: list[int]
+            un estado
+
+        Retorno:
+        =======
+        i, j, diff: tuple[np.ndarray, np.ndarray, np.ndarray]
+            acciones (i[m], j[m]) de self.actions(state) y sus diferencias
+        """
+        if self.neighbors is not None:
+            i, j = self.candidates(state)
+            return i, j, self.gains(state, i, j)
+        if self._pairs is None:
+            self._pairs = np.nonzero(~self._invalid_actions())
+        i, j = self._pairs
+        # las lecturas por bloques de gain_matrix son mas rapidas que
+        # indexar la matriz de distancias en cada par (i, j)
+        return i, j, self.gain_matrix(state)[i, j]
+
+    def added_pairs(self, state: list[int], i: np.ndarray,
+                    j: np.ndarray) -> tuple[np.ndarray, ...]:
+        """Determina las aristas que agrega cada accion.
+
+        La accion (i, j) agrega las aristas (v_i, v_j) y (v_i+1, v_j+1).
+        """
+        tour = np.asarray(state)
+        return tour[i], tour[j], tour[i + 1], tour[j + 1]
+
+    def removed_pairs(self, state: list[int], action: tuple[int, int]) -> list[tuple[int, int]]:
+        """Determina las aristas que elimina una accion.
+
+        La accion (i, j) elimina las aristas (v_i, v_i+1) y (v_j, v_j+1).
+        """
+        i, j = action
+        return [(state[i], state[i + 1]), (state[j], state[j + 1])]
+
+    def gain_matrix(self, state: list[int]) -> np.ndarray:
+        """Calcula la diferencia de valor objetivo de todas las acciones 2-opt.
+
+        Version vectorizada de self.val_diff(state): la celda [i, j] contiene
+        la diferencia al aplicar la accion (i, j). Solo la parte triangular
+        superior correspondiente a acciones validas tiene valores finitos,
+        el resto de las celdas vale -inf.
+
+        Argumentos:
+        ==========
+        state: list[int]
+            un estado
+
+        Retorno:
+        =======
+        gain: np.ndarray
+            matriz de tamaño n x n con las diferencias de valor objetivo
+        """
+        tour = np.asarray(state)
+        v1 = tour[:-1]  # origen de cada arista
+        v2 = tour[1:]  # destino de cada arista
+        d12 = self.dist[v1, v2]
+        gain = self.dist[np.ix_(v1, v1)]
+        gain += self.dist[np.ix_(v2, v2)]
+        np.negative(gain, out=gain)
+        gain += d12[:, None]
+        gain += d12[None, :]
+        gain[self._invalid_actions()] = -np.inf
+        return gain
+
+    def _invalid_actions(self) -> np.ndarray:
+        """Mascara n x n de los pares (i, j) que no son acciones validas."""
+        if self._invalid is None:
+            self._invalid = np.tri(self.n, self.n, 1, dtype=bool)
+            self._invalid[0, self.n - 1] = True
+        return self._invalid
+
+    def best_action(self, state: list[int]) -> tuple[tuple[int, int] | None, float]:
+        """Determina la accion 2-opt con mayor diferencia de valor objetivo.
+
+        Utiliza self.gain_matrix(state), o las acciones candidatas si hay
+        listas de vecinos, evitando construir el diccionario de
+        self.val_diff(state). Los empates se resuelven de forma aleatoria.
+
+        Argumentos:
+        ==========
+        state: list[int]
+            un estado
+
+        Retorno:
+        =======
+        act: tuple[int, int] | None
+            la mejor accion, o None si no hay acciones
+        diff: float
+            diferencia de valor objetivo al aplicar act
+        """
+        if self.n < 4:
+            return None, 0.0
+        if self.neighbors is not None:
+            i, j = self.candidates(state)
+            if len(i) == 0:
+                return None, 0.0
+            gain = self.gains(state, i, j)
+            best = gain.max()
+            k = int(choice(np.flatnonzero(gain == best)))
+            return (int(i[k]), int(j[k])), float(best)
+        gain = self.gain_matrix(state).ravel()
+        best = gain.max()
+        k = int(choice(np.flatnonzero(gain == best)))
+        return divmod(k, self.n), float(best)
+
+    def delta(self, state: list[int], action: tuple[int, int]) -> float:
+        """Determina la diferencia de valor objetivo al aplicar una accion.
+
+        Solo intervienen las cuatro aristas que cambian, el costo es O(1).
+
+        Argumentos:
+        ==========
+        state: list[int]
+            un estado
+        action: tuple[int, int]
+            una accion de self.actions(state)
+
+        Retorno:
+        =======
+        diff: float
+            self.obj_val(self.result(state, action)) - self.obj_val(state)
+        """
+        i, j = action
+        v1, v2, v3, v4 = state[i], state[i + 1], state[j], state[j + 1]
+        dist = self.dist
+        return float(dist[v1, v2] + dist[v3, v4] - dist[v1, v3] - dist[v2, v4])
+
+    def random_action(self, state: list[int],
+                      candidates: np.ndarray | None = None) -> tuple[int, int]:
+        """Elige una accion 2-opt aleatoria en O(1), sin enumerar las acciones.
+
+        Si hay listas de vecinos y el estado es un Tour, se elige una ciudad
+        u, uno de sus vecinos v y una de las dos acciones que agregan la
+        arista (u, v) (ver self.actions_from). Si no, todas las acciones
+        validas tienen la misma probabilidad. Retorna None si no hay
+        acciones (menos de 4 ciudades).
+
+        Argumentos:
+        ==========
+        state: list[int]
+            un estado
+        candidates: np.ndarray | None
+            listas de vecinos de tamaño n x k, si es None se utilizan las de
+            self.neighbors (ver neighborhoods.TwoOpt)
+
+        Retorno:
+        =======
+        act: tuple[int, int]
+            una accion valida, o None si no hay acciones
+        """
+        n = self.n
+        if n < 4:
+            return None
+        if candidates is None:
+            candidates = self.neighbors
+        local = candidates is not None and isinstance(state, Tour)
+        attempts = 0
+        while True:
+            # si los vecinos son siempre adyacentes en el tour, sortear entre todas
+            if local and attempts < MAX_LOCAL_ATTEMPTS:
+                u = randrange(n)
+                v = candidates[u, randrange(candidates.shape[1])]
+                shift = randrange(2)
+                i, j = (state.pos[u] - shift) % n, (state.pos[v] - shift) % n
+                i, j = int(i), int(j)
+            else:
+                i, j = randrange(n), randrange(n)
+            attempts += 1
+            if i > j:
+                i, j = j, i
+            if j - i >= 2 and not (i == 0 and j == n - 1):
+                return i, j
+
+    def sample_gains(self, state: list[int], k: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Elige k acciones 2-opt aleatorias y calcula sus diferencias de valor objetivo.
+
+        Version vectorizada de self.random_action: las acciones se sortean
+        en lotes con la misma distribucion, descartando las invalidas, y
+        se evaluan con self.gains. Los sorteos utilizan un generador de
+        numpy sembrado desde el modulo random, de modo que random.seed
+        alcanza para reproducir los resultados.
+
+        Argumentos:
+        ==========
+        state: list[int]
+            un estado
+        k: int
+            cantidad de acciones
+
+        Retorno:
+        =======
+        i, j, diff: tuple[np.ndarray, np.ndarray, np.ndarray]
+            acciones (i[m], j[m]) y sus diferencias
+        """
+        n = self.n
+        if n < 4:
+            # no hay acciones 2-opt
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty, np.empty(0)
+        rng = np.random.default_rng(getrandbits(64))
+        local = self.neighbors is not None and isinstance(state, Tour)
+        found_i, found_j = [], []
+        missing = k
+        while missing > 0:
+            # se sortean algunas acciones de mas para compensar las invalidas
+            size = missing + missing // 4 + 8
+            if local:
+                u = rng.integers(n, size=size)
+                v = self.neighbors[u, rng.integers(self.neighbors.shape[1], size=size)]
+                shift = rng.integers(2, size=size)
+                a, b = (state.pos[u] - shift) % n, (state.pos[v] - shift) % n
+            else:
+                a, b = rng.integers(n, size=size), rng.integers(n, size=size)
+            i, j = np.minimum(a, b), np.maximum(a, b)
+            valid = (j - i >= 2) & ~((i == 0) & (j == n - 1))
+            i, j = i[valid][:missing], j[valid][:missing]
+            found_i.append(i)
+            found_j.append(j)
+            missing -= len(i)
+        i = np.concatenate(found_i).astype(np.intp)
+        j = np.concatenate(found_j).astype(np.intp)
+        return i, j, self.gains(state, i, j)
+
+    def keys(self, state: list[int]) -> list[int]:
+        """Determina las ciudades del tour (ver OptProblem.keys)."""
+        return list(range(self.n))
+
+    def actions_from(self, state: Tour, city: int,
+                     candidates: Iterable[int] | None = None) -> Iterator[tuple[int, int]]:
+        """Genera las acciones 2-opt que agregan una arista desde una ciudad.
+
+        Para cada ciudad candidata v (sus vecinos mas cercanos, o todas si no
+        hay listas de vecinos) se generan las acciones que agregan la arista
+        (city, v) uniendola con el sucesor y con el predecesor de city.
+
+        Argumentos:
+        ==========
+        state: Tour
+            copia de trabajo de un estado, ver self.encode
+        city: int
+            una ciudad
+        candidates: Iterable[int] | None
+            ciudades candidatas, si es None se utilizan las de self.neighbors
+            (ver neighborhoods.TwoOpt)
+
+        Retorno:
+        =======
+        act: Iterator[tuple[int, int]]
+            acciones validas asociadas a la ciudad
+        """
+        n = self.n
+        pos = state.pos
+        p = int(pos[city])
+        if candidates is not None:
+            cands = candidates
+        elif self.neighbors is not None:
+            cands = self.neighbors[city].tolist()
+        else:
+            cands = range(n)
+        for v in cands:
+            q = int(pos[v])
+            for a, b in ((p, q), ((p - 1) % n, (q - 1) % n)):
+                i, j = (a, b) if a < b else (b, a)
+                if j - i >= 2 and not (i == 0 and j == n - 1):
+                    yield i, j
+
+    def touched(self, state: list[int], action: tuple[int, int]) -> list[int]:
+        """Determina las ciudades cuyas aristas cambian al aplicar una accion."""
+        i, j = action
+        return [state[i], state[i + 1], state[j], state[j + 1]]
+
+    def nearest(self, k: int) -> np.ndarray:
+        """Listas de las k ciudades mas cercanas a cada ciudad.
+
+        Si el problema tiene listas de vecinos (ver self.neighbors) se
+        retornan esas. Si no, se calculan una unica vez por cada k, de modo
+        que los vecindarios y algoritmos que las necesitan las comparten.
+        """
+        if self.neighbors is not None:
+            return self.neighbors
+        if k not in self._nearest:
+            self._nearest[k] = distance.nearest_neighbors(k, self.dist, self.coords, self.kind)
+        return self._nearest[k]
+
+    def construct(self, name: str) -> list[int]:
+        """Construye un estado con una heuristica constructiva.
+
+        Argumentos:
+        ==========
+        name: str
+            nombre de la heuristica (ver construct.CONSTRUCTIONS): 'identity',
+            'random', 'nn', 'greedy', 'christofides' o 'hilbert'
+
+        Retorno:
+        =======
+        state: list[int]
+            un estado de la forma [0, ..., 0]
+        """
+        return CONSTRUCTIONS[name](self)
+
+    def neighborhood(self, name: str, **options) -> Neighborhood:
+        """Construye un vecindario del TSP (ver neighborhoods.NEIGHBORHOODS).
+
+        Argumentos:
+        ==========
+        name: str
+            nombre del vecindario: '2opt', 'oropt', 'swap', '3opt' o 'lk'
+        options:
+            parametros adicionales del vecindario
+        """
+        return NEIGHBORHOODS[name](self, **options)
+
+    @contextmanager
+    def shared(self) -> Iterator[tuple[Callable[..., TSP], tuple]]:
+        """Comparte la matriz de distancias con otros procesos.
+
+        La matriz se copia una unica vez a un bloque de memoria compartida;
+        los procesos la leen sin copiarla (ver OptProblem.shared). Si la
+        matriz proviene de la cache en disco, los procesos abren el mismo
+        archivo como memoria mapeada y no se copia. Si las distancias se
+        calculan a demanda se envia una copia del problema, que solo
+        contiene las coordenadas.
+        """
+        if isinstance(self.dist, distance.DistanceOracle):
+            # solo se envian las coordenadas
+            yield _identity, (self,)
+            return
+        if self._dist_file is not None:
+            yield TSP.attach_file, (self._dist_file, self.coords, self.neighbors, self.kind)
+            return
+        shm = SharedMemory(create=True, size=self.dist.nbytes)
+        try:
+            dist = np.ndarray(self.dist.shape, dtype=self.dist.dtype, buffer=shm.buf)
+            dist[:] = self.dist
+            del dist
+            yield TSP.attach, (shm.name, self.dist.shape, self.coords, self.neighbors, self.kind)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    @classmethod
+    def attach(cls, name: str, shape: tuple[int, int],
+               coords: np.ndarray | None, neighbors: np.ndarray | None,
+               kind: str | None = None) -> TSP:
+        """Construye una instancia de TSP sobre una matriz en memoria compartida.
+
+        Argumentos:
+        ==========
+        name: str
+            nombre del bloque de memoria compartida creado por self.shared
+        shape: tuple[int, int]
+            forma de la matriz de distancias
+        coords: np.ndarray | None
+            coordenadas de las ciudades
+        neighbors: np.ndarray | None
+            listas de vecinos ya calculadas
+        kind: str | None
+            tipo de distancia de las coordenadas
+        """
+        shm = SharedMemory(name=name)
+        problem = cls(dist=np.ndarray(shape, dtype=np.float64, buffer=shm.buf),
+                      coords=coords, kind=kind)
+        problem.neighbors = neighbors
+        problem._shm = shm  # mantener el bloque abierto mientras exista el problema
+        return problem
+
+    @classmethod
+    def attach_file(cls, path: str, coords: np.ndarray | None,
+                    neighbors: np.ndarray | None, kind: str | None = None) -> TSP:
+        """Construye una instancia de TSP sobre una matriz en cache.
+
+        Argumentos:
+        ==========
+        path: str
+            archivo ".npy" con la matriz (ver distance.cached_matrix)
+        coords: np.ndarray | None
+            coordenadas de las ciudades
+        neighbors: np.ndarray | None
+            listas de vecinos ya calculadas
+        kind: str | None
+            tipo de distancia de las coordenadas
+        """
+        problem = cls(dist=np.load(path, mmap_mode='r'), coords=coords, kind=kind)
+        problem.neighbors = neighbors
+        return problem
+
+    def encode(self, state: list[int], evaluated: bool = False) -> Tour:
+        """Construye una copia de trabajo del estado (ver tour.Tour).
+
+        Con evaluated=True la copia conoce su longitud y la actualiza en cada
+        movimiento (ver tour.EvaluatedTour), a costa de consultar las
+        distancias de las aristas que cambian.
+        """
+        if evaluated:
+            return EvaluatedTour(state, self.dist)
+        return Tour(state)
+
+    def decode(self, state: Tour) -> list[int]:
+        """Recupera el estado [0, ..., 0] a partir de una copia de trabajo."""
+        return state.tolist()
+
+    def apply(self, state: Tour, action: tuple[int, int]) -> Tour:
+        """Aplica una accion 2-opt in situ sobre una copia de trabajo.
+
+        Se invierte el lado mas corto del ciclo, sin copiar el tour.
+        """
+        state.two_opt(*action)
+        return state
 
     def random_reset(self) -> None:
         """Reinicia de forma aleatoria del estado inicial del TSP."""
-        self.init = [i for i in range(1, self.G.number_of_nodes())]
+        self.init = [i for i in range(1, self.n)]
         shuffle(self.init)  # mezclar la lista
         self.init.append(0)  # agregar a 0 como inicio del tour
         self.init.insert(0, 0)  # agregar a 0 como fin del tour
+
+
+def _identity(problem: OptProblem) -> OptProblem:
+    """Retorna el mismo problema (ver OptProblem.shared)."""
+    return problem
@@ -0,0 +1,200 @@
+"""Este modulo define las herramientas de perfilado de las busquedas locales.
+
+* Profile: acumula el tiempo y la cantidad de llamadas de cada metodo del
+problema y de los vecindarios (las fases de la busqueda), junto con los
+contadores de movimientos evaluados, movimientos aplicados, copias de
+estados y reinicios (ver search.LocalSearch.profile).
+
+* cprofile: ejecuta una funcion con cProfile y guarda el reporte.
+
+Para medir las fases, el problema se envuelve en un objeto Instrumented
+que delega cada llamada midiendo su duracion. Los algoritmos no cambian
+y, si el perfilado esta desactivado, no se envuelve nada, por lo que no
+tiene ningun costo. Las tareas que se ejecutan en otros procesos miden
+con su propio perfil, que luego se acumula con Profile.merge; los tiempos
+se suman entre procesos, por lo que pueden superar el tiempo total.
+
+El tiempo de cada fase es exclusivo: no incluye el de las fases medidas
+que se llaman desde ella. Los metodos de INLINED se ejecutan sobre el
+objeto envuelto, de modo que sus llamadas internas (por ejemplo la
+construccion de la matriz de ganancias en TSP.best_action) se miden como
+fases separadas.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable
+from inspect import isgenerator
+from time import perf_counter
+import cProfile
+import pstats
+
+# Contador asociado a cada metodo y la cantidad a sumar segun su resultado
+COUNTERS: dict[str, tuple[str, Callable[[Any], int]]] = {
+    'delta': ('evaluated', lambda result: 1),
+    'val_diff': ('evaluated', len),
+    'gains': ('evaluated', len),
+    # solo las n (n - 3) / 2 acciones validas de la matriz de n x n
+    'gain_matrix': ('evaluated', lambda result: len(result) * (len(result) - 3) // 2),
+    'move_gains': ('evaluated', lambda result: len(result[2])),
+    'sample_gains': ('evaluated', lambda result: len(result[2])),
+    'apply': ('applied', lambda result: 1),
+    'result': ('copies', lambda result: 1),
+    'encode': ('copies', lambda result: 1),
+    'decode': ('copies', lambda result: 1),
+    'random_reset': ('restarts', lambda result: 1),
+}
+
+# Metodos cuyo resultado tambien se envuelve (ver OptProblem.neighborhood)
+WRAPPED_RESULTS = {'neighborhood'}
+
+# Metodos que se ejecutan sobre el objeto envuelto, para medir sus llamadas internas
+INLINED = {'best_action'}
+
+
+class Profile:
+    """Clase que acumula los tiempos por fase y los contadores de una busqueda."""
+
+    def __init__(self) -> None:
+        """Construye una instancia de la clase."""
+        self.reset()
+
+    def __repr__(self):
+        """Representacion del perfil."""
+        return "<Profile {}>".format(self.counters)
+
+    def reset(self) -> None:
+        """Descarta las mediciones acumuladas."""
+        self.times: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.counters = {'evaluated': 0, 'applied': 0, 'copies': 0, 'restarts': 0}
+        self.nested = 0.0  # tiempo de las fases llamadas desde la fase en curso
+
+    def add(self, phase: str, elapsed: float) -> None:
+        """Acumula una llamada de una fase."""
+        self.times[phase] = self.times.get(phase, 0.0) + elapsed
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def enter(self) -> float:
+        """Comienza una llamada anidada, retorna el tiempo anidado de la fase exterior."""
+        outer = self.nested
+        self.nested = 0.0
+        return outer
+
+    def leave(self, phase: str, elapsed: float, outer: float) -> None:
+        """Termina una llamada anidada, acumulando su tiempo exclusivo en phase."""
+        self.add(phase, elapsed - self.nested)
+        self.nested = outer + elapsed
+
+    def merge(self, other: Profile) -> None:
+        """Acumula las mediciones de otro perfil (por ejemplo, el de un proceso)."""
+        for phase, elapsed in other.times.items():
+            self.times[phase] = self.times.get(phase, 0.0) + elapsed
+            self.calls[phase] = self.calls.get(phase, 0) + other.calls[phase]
+        for counter, amount in other.counters.items():
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def wrap(self, target: Any) -> Instrumented:
+        """Envuelve un problema o vecindario para medir sus metodos."""
+        return Instrumented(target, self)
+
+    def report(self, total: float | None = None) -> list[tuple[str, int, float, float | None]]:
+        """Filas (fase, llamadas, tiempo, fraccion de total) ordenadas por tiempo."""
+        rows = sorted(self.times.items(), key=lambda item: -item[1])
+        return [(phase, self.calls[phase], elapsed, elapsed / total if total else None)
+                for phase, elapsed in rows]
+
+
+class Instrumented:
+    """Clase que delega en un objeto midiendo la duracion de sus metodos.
+
+    Los atributos que no son metodos (por ejemplo problem.init o problem.n)
+    se leen y escriben directamente en el objeto envuelto. Si un metodo
+    retorna un generador, se mide el tiempo de cada elemento generado (y
+    cada elemento cuenta como una llamada).
+    """
+
+    def __init__(self, target: Any, profile: Profile) -> None:
+        """Construye una instancia de la clase.
+
+        Argumentos:
+        ==========
+        target: Any
+            objeto envuelto, un problema o un vecindario
+        profile: Profile
+            perfil donde se acumulan las mediciones
+        """
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_profile', profile)
+        object.__setattr__(self, '_prefix', type(target).__name__ + '.')
+
+    def __getattr__(self, name: str) -> Any:
+        """Delega el atributo, envolviendo los metodos publicos."""
+        attr = getattr(self._target, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        method = self._measure(name, attr)
+        object.__setattr__(self, name, method)  # no volver a pasar por __getattr__
+        return method
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Modifica el atributo en el objeto envuelto."""
+        setattr(self._target, name, value)
+
+    def _measure(self, name: str, method: Callable) -> Callable:
+        """Construye una version de method que acumula su tiempo en el perfil."""
+        profile = self._profile
+        phase = self._prefix + name
+        counter, amount = COUNTERS.get(name, (None, None))
+        wrap_result = name in WRAPPED_RESULTS
+        if name in INLINED:
+            # self es el objeto envuelto, sus llamadas internas tambien se miden
+            method = getattr(type(self._target), name).__get__(self)
+
+        def measured(*args, **kwargs):
+            outer = profile.enter()
+            start = perf_counter()
+            result = method(*args, **kwargs)
+            if isgenerator(result):
+                # el trabajo se realiza al pedir cada elemento
+                profile.nested = outer
+                return _measure_generator(result, profile, phase)
+            profile.leave(phase, perf_counter() - start, outer)
+            if counter is not None:
+                profile.counters[counter] += amount(result)
+            if wrap_result:
+                return profile.wrap(result)
+            return result
+        return measured
+
+
+def _measure_generator(gen, profile: Profile, phase: str):
+    """Genera los elementos de gen acumulando el tiempo de cada uno en phase."""
+    while True:
+        outer = profile.enter()
+        start = perf_counter()
+        try:
+            item = next(gen)
+        except StopIteration:
+            profile.leave(phase, perf_counter() - start, outer)
+            return
+        profile.leave(phase, perf_counter() - start, outer)
+        yield item
+
+
+def cprofile(path: str, func: Callable, *args) -> Any:
+    """Ejecuta func(*args) con cProfile y guarda el reporte.
+
+    Se guardan las estadisticas en path (para pstats o snakeviz) y un
+    resumen de las 30 funciones con mayor tiempo acumulado en path + '.txt'.
+
+    Retorno:
+    =======
+    result: Any
+        el resultado de func(*args)
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args)
+    profiler.dump_stats(path)
+    with open(path + '.txt', 'w') as f:
+        pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(30)
+    return result
@@ -0,0 +1,78 @@
+"""Este modulo define la clase Trace.
+
+Trace registra la curva de convergencia de una busqueda local: cada vez
+que mejora el mejor valor objetivo se guarda una fila con el tiempo
+transcurrido, la iteracion y el valor (ver search.LocalSearch.trace).
+
+Las filas se almacenan en un arreglo de numpy preasignado, que duplica su
+capacidad al llenarse, por lo que registrar una mejora es O(1) amortizado
+y no genera objetos de python.
+
+Requiere del paquete numpy.
+"""
+
+from __future__ import annotations
+from time import time
+import numpy as np
+
+
+class Trace:
+    """Clase que representa la traza de mejoras de una busqueda local."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """Construye una instancia de la clase.
+
+        Argumentos:
+        ==========
+        capacity: int
+            cantidad de filas preasignadas (por defecto 1024)
+        """
+        self.data = np.empty((capacity, 3), dtype=np.float64)
+        self.size = 0
+        self.t0 = time()
+
+    def __repr__(self):
+        """Representacion de la traza."""
+        return "<Trace {} mejoras>".format(self.size)
+
+    def __len__(self) -> int:
+        """Cantidad de mejoras registradas."""
+        return self.size
+
+    def start(self) -> None:
+        """Vacia la traza al comenzar una busqueda."""
+        self.size = 0
+        self.t0 = time()
+
+    def record(self, niters: int, value: float) -> None:
+        """Registra una mejora del mejor valor objetivo.
+
+        Argumentos:
+        ==========
+        niters: int
+            iteracion en la que se encontro la mejora
+        value: float
+            nuevo mejor valor objetivo
+        """
+        if self.size == len(self.data):
+            self.data = np.concatenate((self.data, np.empty_like(self.data)))
+        row = self.data[self.size]
+        row[0] = time() - self.t0
+        row[1] = niters
+        row[2] = value
+        self.size += 1
+
+    @property
+    def times(self) -> np.ndarray:
+        """Tiempo transcurrido (en segundos) en cada mejora."""
+        return self.data[:self.size, 0]
+
+    @property
+    def iters(self) -> np.ndarray:
+        """Iteracion de cada mejora."""
+        return self.data[:self.size, 1]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Mejor valor objetivo luego de cada mejora."""
+        return self.data[:self.size, 2]
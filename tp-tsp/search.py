@@ -9,25 +9,58 @@ Las subclases que se encuentran en este modulo son:
 mejor valor objetivo, y los empates se resuelvan de forma aleatoria.
 Ya viene implementado.
 
+* VariableNeighborhoodDescent: ascension de colinas de primer mejora que
+alterna entre varios vecindarios (2-opt, Or-opt, intercambio y 3-opt).
+
+* LinKernighan: descenso por vecindarios que combina movimientos de
+profundidad variable estilo Lin-Kernighan con Or-opt.
+
+* SimulatedAnnealing: recocido simulado. Evalua una accion aleatoria por
+iteracion y la acepta segun la temperatura.
+
 * HillClimbingReset: algoritmo de ascension de colinas de reinicio aleatorio.
 No viene implementado, se debe completar.
 
-* Tabu: algoritmo de busqueda tabu.
-No viene implementado, se debe completar.
+* Tabu: algoritmo de busqueda tabu. Se mueve al mejor sucesor admisible
+segun una memoria tabu de atributos de los movimientos.
+
+* Genetic: algoritmo genetico memetico. Mantiene una poblacion de estados,
+los cruza con order crossover y pule cada hijo con primer mejora.
+
+Ademas de su propio criterio de parada, cada algoritmo se detiene segun
+su atributo termination (tiempo, iteraciones, estancamiento o valor
+objetivo, ver termination.Termination). Con el atributo profile se miden
+los tiempos de cada fase (ver profiling.Profile).
 """
 
 from __future__ import annotations
 
-from typing import Optional, List, Set
+from typing import Callable, Iterator, Optional
 
 from problem import OptProblem, State
 from node import Node
-from random import choice, sample
+from termination import Termination
+from progress import Trace
+from profiling import Profile
+from random import Random, choice, random, randrange, sample, seed as seed_random
 from time import time
+from math import exp
+from collections import deque
+from itertools import count
+from queue import Queue
+from threading import Thread
+from multiprocessing import Event
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Iteraciones del recocido simulado entre enfriamientos, por elemento del estado
+STEPS_PER_ELEMENT = 10
+# Enfriamientos del recocido simulado hasta alcanzar la temperatura minima
+COOLINGS = 100
+
 
 class LocalSearch:
     """Clase que representa un algoritmo de busqueda local general."""
@@ -38,6 +71,140 @@ class LocalSearch:
         self.time = 0  # Tiempo de ejecucion
         self.tour = []  # Solucion, inicialmente vacia
         self.value = None  # Valor objetivo de la solucion
+        # Criterio de parada adicional, por defecto sin limites (ver termination.py)
+        self.termination = Termination()
+        # Registro de las mejoras, por defecto desactivado (ver progress.Trace)
+        self.trace: Trace | None = None
+        # Funcion callback(tiempo, iteracion, valor) llamada en cada mejora,
+        # si retorna True se detiene la busqueda
+        self.callback: Callable[[float, int, float], bool | None] | None = None
+        self.monitoring = False
+        # Tiempos por fase y contadores, por defecto desactivado (ver profiling.py)
+        self.profile: Profile | None = None
+        # Evento que detiene la busqueda al cerrar self.stream, compartido
+        # con los procesos de los grupos de procesos (ver pool_abort)
+        self._abort: Event | None = None
+        self._pool_abort: Event | None = None  # evento del grupo de procesos en curso
+
+    def __getstate__(self) -> dict:
+        """Estado serializable, sin la traza, el callback, el perfil ni los eventos de aborto.
+
+        Ver HillClimbingReset.solve_parallel.
+        """
+        state = self.__dict__.copy()
+        state['trace'] = None
+        state['callback'] = None
+        state['profile'] = None
+        state['_abort'] = None
+        state['_pool_abort'] = None
+        return state
+
+    def instrument(self, problem: OptProblem) -> OptProblem:
+        """Envuelve el problema para medir sus fases si self.profile esta activo.
+
+        Si el perfilado esta desactivado retorna el mismo problema.
+        """
+        if self.profile is None:
+            return problem
+        return self.profile.wrap(problem)
+
+    def begin(self) -> None:
+        """Inicia el criterio de parada y el registro de mejoras de una busqueda."""
+        self.termination.start()
+        if self.trace is not None:
+            self.trace.start()
+        self._start = time()
+        self._best = float('-inf')
+        self._aborted = False
+        # Si no hay nada que verificar, los ciclos pueden omitir self.stop
+        self.monitoring = self.termination.active or self.trace is not None \
+            or self.callback is not None
+
+    def stop(self, niters: int, value: float) -> bool:
+        """Registra una iteracion y determina si la busqueda debe detenerse.
+
+        Si value mejora el mejor valor objetivo se registra en self.trace y
+        se informa a self.callback. Ver termination.Termination.stop.
+
+        Argumentos:
+        ==========
+        niters: int
+            iteraciones realizadas
+        value: float
+            mejor valor objetivo encontrado
+        """
+        if value > self._best:
+            self._best = value
+            if self.trace is not None:
+                self.trace.record(niters, value)
+            if self.callback is not None and self.callback(time() - self._start, niters, value):
+                self._aborted = True
+                self.termination.reason = 'callback'
+        if not self._aborted and self._abort is not None and self._abort.is_set():
+            self._aborted = True
+            self.termination.reason = 'abort'
+        return self._aborted or self.termination.stop(niters, value)
+
+    def stop_from(self, niters: int, value: float) -> Callable[[int, float], bool] | None:
+        """Adapta self.stop a un ascenso que parte de niters iteraciones y valor value.
+
+        Retorna None si no hay nada que verificar (ver descend).
+        """
+        if not self.monitoring:
+            return None
+        stop = self.stop
+        return lambda k, gain: stop(niters + k, value + gain)
+
+    def stream(self, problem: OptProblem) -> Iterator[tuple[float, int, float]]:
+        """Resuelve un problema generando las mejoras a medida que se encuentran.
+
+        La busqueda se ejecuta en un hilo aparte. Cada elemento generado es
+        una tupla (tiempo, iteracion, valor). Al cerrar el generador antes
+        de terminar (por ejemplo con break) se detiene la busqueda. Al
+        finalizar, el resultado queda en self.tour y self.value.
+
+        Argumentos:
+        ==========
+        problem: OptProblem
+            un problema de optimizacion
+        """
+        events = Queue()
+        # self.stop verifica el evento en cada iteracion, no solo en cada mejora,
+        # y los procesos de los grupos de procesos tambien lo reciben
+        abort = self._abort = Event()
+        previous = self.callback
+
+        def publish(elapsed: float, niters: int, value: float) -> bool:
+            if previous is not None and previous(elapsed, niters, value):
+                return True
+            events.put((elapsed, niters, value))
+            return False
+
+        def run() -> None:
+            try:
+                self.solve(problem)
+            finally:
+                events.put(None)
+
+        self.callback = publish
+        worker = Thread(target=run, daemon=True)
+        worker.start()
+        try:
+            while (event := events.get()) is not None:
+                yield event
+        finally:
+            abort.set()
+            worker.join()
+            self.callback = previous
+            self._abort = None
+
+    def pool_abort(self) -> Event:
+        """Evento que detiene las tareas de un grupo de procesos (ver _init_worker).
+
+        Es el de self.stream si lo hay; si no, uno nuevo que el algoritmo
+        activa al detenerse.
+        """
+        return self._abort if self._abort is not None else Event()
 
     def solve(self, problem: OptProblem):
         """Resuelve un problema de optimizacion."""
@@ -50,8 +217,27 @@ class HillClimbing(LocalSearch):
 
     En cada iteracion se mueve al estado sucesor con mejor valor objetivo.
     El criterio de parada es alcanzar un optimo local.
+
+    Con first_improvement=True se mueve en cambio a la primer accion que
+    mejora el valor objetivo, utilizando bits "don't-look": solo se
+    examinan las acciones de los elementos afectados por los ultimos
+    movimientos (ver OptProblem.keys y OptProblem.actions_from). Si el
+    problema no tiene listas de vecinos, se utilizan las de sus neighbors
+    ciudades mas cercanas, de modo que cada paso examina una cantidad
+    constante de acciones.
     """
 
+    def __init__(self, first_improvement: bool = False, neighbors: int | None = 10) -> None:
+        """Construye una instancia de la clase.
+
+        first_improvement: bool True para la variante de primer mejora (por defecto False)
+        neighbors: int | None vecinos candidatos por ciudad en la variante de primer mejora si el
+            problema no tiene listas de vecinos (por defecto 10, None para examinar todas las ciudades)
+        """
+        super().__init__()
+        self.first_improvement = first_improvement
+        self.neighbors = neighbors
+
     def solve(self, problem: OptProblem):
         """Resuelve un problema de optimizacion con ascension de colinas.
 
@@ -60,51 +246,435 @@ class HillClimbing(LocalSearch):
         problem: OptProblem
             un problema de optimizacion
         """
+        problem = self.instrument(problem)
+        if self.first_improvement:
+            return self.solve_first_improvement(problem)
         # Inicio del reloj
         start = time()
-        # Crear el nodo inicial
-        actual = Node(problem.init, problem.obj_val(problem.init))
+        self.begin()
+        # Crear el nodo inicial (con una copia de trabajo del estado)
+        actual = Node(problem.encode(problem.init), problem.obj_val(problem.init))
 
         while True:
             # Determinar las acciones que se pueden aplicar
             # y las diferencias en valor objetivo que resultan
-            diff = problem.val_diff(actual.state)
-            # Buscar las acciones que generan el  mayor incremento de valor obj
-            max_acts = [act for act, val in diff.items() if val == max(diff.values())]
-            # Elegir una accion aleatoria
-            act = choice(max_acts)
-            # Retornar si estamos en un optimo local
-
-            if diff[act] <= 0:
-                self.tour = actual.state
+            # Buscar una accion que genere el mayor incremento de valor obj
+            # (los empates se resuelven de forma aleatoria)
+            act, diff = problem.best_action(actual.state)
+            # Retornar si estamos en un optimo local o se cumple el criterio de parada
+
+            if self.stop(self.niters, actual.value) or act is None or diff <= 0:
+                self.tour = problem.decode(actual.state)
                 self.value = actual.value
                 end = time()
                 self.time = end - start
                 return
             # Sino, moverse a un nodo con el estado sucesor
             else:
-                actual = Node(problem.result(actual.state, act), actual.value + diff[act])
+                actual = Node(problem.apply(actual.state, act), actual.value + diff)
                 self.niters += 1
 
+    def solve_first_improvement(self, problem: OptProblem):
+        """Resuelve un problema con ascension de colinas de primer mejora.
+
+        Ver descend.
+
+        Argumentos:
+        ==========
+        problem: OptProblem
+            un problema de optimizacion
+        """
+        # Inicio del reloj
+        start = time()
+        self.begin()
+        moves = problem.neighborhood('2opt', neighbors=self.neighbors)
+        state = problem.encode(problem.init)
+        value = problem.obj_val(problem.init)
+        state, gain, niters = descend(moves, state, problem.keys(state),
+                                      self.stop_from(self.niters, value))
+        self.tour = problem.decode(state)
+        self.value = value + gain
+        self.niters += niters
+        end = time()
+        self.time = end - start
+
+
+def descend(moves, state: State, keys: list,
+            stop: Callable[[int, float], bool] | None = None) -> tuple[State, float, int]:
+    """Ascenso de colinas de primer mejora con bits "don't-look".
+
+    Los elementos a examinar se mantienen en una cola; un elemento sale
+    de la cola (su bit don't-look se enciende) cuando ninguna de sus
+    acciones mejora, y vuelve a entrar cuando un movimiento lo afecta.
+
+    Argumentos:
+    ==========
+    moves: OptProblem o vecindario
+        provee actions_from, delta, touched y apply (ver OptProblem)
+    state: State
+        copia de trabajo del estado inicial, se modifica in situ
+    keys: list
+        elementos a examinar inicialmente
+    stop: Callable[[int, float], bool] | None
+        criterio de parada adicional, recibe los movimientos aplicados y
+        la diferencia de valor objetivo acumulada (ver LocalSearch.stop_from)
+
+    Retorno:
+    =======
+    tuple: el estado final, la diferencia de valor objetivo acumulada
+    y la cantidad de movimientos aplicados
+    """
+    gain = 0.0
+    niters = 0
+    # Los elementos indicados comienzan con el bit don't-look apagado
+    active = deque(keys)
+    queued = set(active)
+
+    while active:
+        if stop is not None and stop(niters, gain):
+            break
+        key = active.popleft()
+        queued.discard(key)
+        for act in moves.actions_from(state, key):
+            diff = moves.delta(state, act)
+            if diff > 0:
+                # Volver a examinar los elementos afectados
+                for k in moves.touched(state, act):
+                    if k not in queued:
+                        queued.add(k)
+                        active.append(k)
+                state = moves.apply(state, act)
+                gain += diff
+                niters += 1
+                break
+    return state, gain, niters
+
+
+class VariableNeighborhoodDescent(LocalSearch):
+    """Clase que representa un algoritmo de descenso por vecindarios variables.
+
+    Recorre una lista de vecindarios (ver OptProblem.neighborhood)
+    realizando un ascenso de primer mejora en cada uno. Al mejorar con un
+    vecindario que no es el primero se vuelve al primero. El criterio de
+    parada es alcanzar un optimo local de todos los vecindarios.
+
+    Si el problema no tiene listas de vecinos, los vecindarios utilizan
+    las de sus neighbors ciudades mas cercanas: sin ellas cada ciudad
+    examina O(n) movimientos (O(n^2) en 3-opt).
+    """
+
+    def __init__(self, neighborhoods: tuple[str, ...] = ('2opt', 'oropt', 'swap', '3opt'),
+                 neighbors: int | None = 10) -> None:
+        """Construye una instancia de la clase.
+
+        neighborhoods: tuple[str, ...] nombres de los vecindarios, en el orden en que se exploran
+        neighbors: int | None vecinos candidatos por ciudad si el problema no tiene listas de vecinos
+            (por defecto 10, None para examinar todas las ciudades)
+        """
+        super().__init__()
+        self.neighborhoods = neighborhoods
+        self.neighbors = neighbors
+
+    def moves(self, problem: OptProblem) -> list:
+        """Construye los vecindarios a explorar."""
+        return [problem.neighborhood(name, neighbors=self.neighbors) for name in self.neighborhoods]
+
+    def solve(self, problem: OptProblem):
+        """Resuelve un problema de optimizacion con descenso por vecindarios variables.
+
+        Argumentos:
+        ==========
+        problem: OptProblem
+            un problema de optimizacion
+        """
+        # Inicio del reloj
+        start = time()
+        self.begin()
+        problem = self.instrument(problem)
+        moves = self.moves(problem)
+        state = problem.encode(problem.init)
+        value = problem.obj_val(problem.init)
+        k = 0
+        while k < len(moves) and not self.stop(self.niters, value):
+            state, gain, niters = descend(moves[k], state, problem.keys(state),
+                                          self.stop_from(self.niters, value))
+            value += gain
+            self.niters += niters
+            # Volver al primer vecindario si otro vecindario logro mejorar
+            k = 0 if niters > 0 and k > 0 else k + 1
+        self.tour = problem.decode(state)
+        self.value = value
+        end = time()
+        self.time = end - start
+
+
+class LinKernighan(VariableNeighborhoodDescent):
+    """Clase que representa un algoritmo de busqueda local estilo Lin-Kernighan.
+
+    Alterna movimientos de profundidad variable (cadenas de movimientos
+    2-opt, ver neighborhoods.LinKernighan) con reubicaciones Or-opt, con
+    bits don't-look y listas de vecinos.
+    """
+
+    def __init__(self, max_depth: int = 10, neighbors: int = 10) -> None:
+        """Construye una instancia de la clase.
+
+        max_depth: int longitud maxima de las cadenas de movimientos (por defecto 10)
+        neighbors: int vecinos candidatos por ciudad si el problema no tiene listas de vecinos (por defecto 10)
+        """
+        super().__init__(neighborhoods=('lk', 'oropt'), neighbors=neighbors)
+        self.max_depth = max_depth
+
+    def moves(self, problem: OptProblem) -> list:
+        """Construye los vecindarios Lin-Kernighan y Or-opt."""
+        return [problem.neighborhood('lk', max_depth=self.max_depth, neighbors=self.neighbors),
+                problem.neighborhood('oropt', neighbors=self.neighbors)]
+
+
+class SimulatedAnnealing(LocalSearch):
+    """Clase que representa un algoritmo de recocido simulado.
+
+    En cada iteracion se elige una accion aleatoria (ver
+    OptProblem.random_action) y se calcula su diferencia de valor objetivo
+    en O(1) (ver OptProblem.delta). Si mejora se aplica; si no, se aplica
+    con probabilidad exp(diff / T), donde T es la temperatura actual.
+    La temperatura disminuye segun un esquema de enfriamiento.
+    El criterio de parada es alcanzar max_iters iteraciones o la
+    temperatura minima.
+
+    Las acciones se sortean entre las que acercan una ciudad a uno de sus
+    neighbors vecinos mas cercanos (ver neighborhoods.TwoOpt) y la
+    cantidad de iteraciones entre enfriamientos crece con el tamaño del
+    problema, de modo que cada elemento se examina una cantidad similar
+    de veces a cada temperatura. Por defecto la temperatura alcanza t_min
+    en coolings enfriamientos, por lo que se realizan a lo sumo
+    coolings * STEPS_PER_ELEMENT * n iteraciones. En Python puro se
+    evaluan del orden de 10^5 acciones por segundo.
+    """
+
+    def __init__(self, max_iters: int | None = None, t0: float | None = None,
+                 alpha: float | None = None, steps: int | None = None, t_min: float = 1e-3,
+                 schedule: Callable[[float, int], float] | None = None,
+                 neighbors: int | None = 10, coolings: int = COOLINGS):
+        """Construye una instancia de la clase.
+
+        max_iters: int | None número máximo de iteraciones (por defecto, None: sin limite)
+        t0: float temperatura inicial (por defecto, None: se estima con acciones aleatorias)
+        alpha: float | None factor del enfriamiento geometrico
+            (por defecto, None: el que lleva de t0 a t_min en coolings enfriamientos)
+        steps: int | None iteraciones entre cada enfriamiento (por defecto, None: STEPS_PER_ELEMENT * n)
+        t_min: float temperatura minima (por defecto, 1e-3)
+        schedule: Callable[[float, int], float] temperatura en funcion de t0 y del numero
+            de enfriamientos realizados (por defecto, None: t0 * alpha ** k)
+        neighbors: int | None vecinos candidatos por ciudad si el problema no tiene listas de vecinos
+            (por defecto 10, None para sortear entre todas las acciones)
+        coolings: int enfriamientos hasta t_min si alpha es None (por defecto, COOLINGS)
+        """
+        if t0 is not None and t0 <= 0:
+            raise ValueError("La temperatura inicial debe ser positiva: {}".format(t0))
+        super().__init__()
+        self.max_iters = max_iters
+        self.t0 = t0
+        self.alpha = alpha
+        self.steps = steps
+        self.t_min = t_min
+        self.schedule = schedule
+        self.neighbors = neighbors
+        self.coolings = coolings
+
+    @staticmethod
+    def initial_temperature(problem: OptProblem, state: State, samples: int = 100) -> float:
+        """
+        Estima una temperatura inicial a partir de acciones aleatorias.
+        Se elige T tal que una accion que empeora en el promedio de las
+        acciones que empeoran se acepte con probabilidad 1/2.
+        """
+        if problem.random_action(state) is None:
+            return 1.0
+        worse = [-d for d in (problem.delta(state, problem.random_action(state))
+                              for _ in range(samples)) if d < 0]
+        if not worse:
+            return 1.0
+        return sum(worse) / len(worse) / 0.6931471805599453  # ln 2
+
+    def temperature(self, t0: float, k: int) -> float:
+        """Temperatura luego de k enfriamientos."""
+        if self.schedule is not None:
+            return self.schedule(t0, k)
+        if self.alpha is not None:
+            return t0 * self.alpha ** k
+        if t0 <= self.t_min:
+            return 0.0
+        return t0 * (self.t_min / t0) ** (k / self.coolings)
+
+    def solve(self, problem: OptProblem):
+        """Resuelve un problema de optimizacion con recocido simulado.
+
+        Argumentos:
+        ==========
+        problem: OptProblem
+            un problema de optimizacion
+        """
+        # Inicio del reloj
+        start = time()
+        problem = self.instrument(problem)
+        state = problem.encode(problem.init)
+        value = problem.obj_val(problem.init)
+        best_tour = problem.decode(state)
+        best_value = value
+        # El estado actual es el mejor encontrado y aun no fue copiado
+        best_is_actual = False
+
+        moves = problem.neighborhood('2opt', neighbors=self.neighbors)
+        steps = self.steps if self.steps is not None else STEPS_PER_ELEMENT * len(problem.keys(state))
+        t0 = self.t0 if self.t0 is not None else self.initial_temperature(moves, state)
+        temp = t0
+        random_action, delta, apply = moves.random_action, moves.delta, moves.apply
+        self.begin()
+        stop = self.stop if self.monitoring else None
+        iters = count(1) if self.max_iters is None else range(1, self.max_iters + 1)
+        for it in iters:
+            act = random_action(state)
+            if act is None:
+                break  # no hay acciones
+            diff = delta(state, act)
+            if diff > 0 or random() < exp(diff / temp):
+                if best_is_actual and diff <= 0:
+                    best_tour = problem.decode(state)
+                    best_is_actual = False
+                state = apply(state, act)
+                value += diff
+                if value > best_value:
+                    best_value = value
+                    best_is_actual = True
+            self.niters += 1
+            if stop is not None and stop(self.niters, best_value):
+                break
+            # Enfriar cada steps iteraciones
+            if it % steps == 0:
+                temp = self.temperature(t0, it // steps)
+                # con temperatura nula o negativa exp(diff / temp) no es una probabilidad
+                if temp <= self.t_min or temp <= 0:
+                    break
+        if best_is_actual:
+            best_tour = problem.decode(state)
+        self.tour = best_tour
+        self.value = best_value
+        end = time()
+        self.time = end - start
+
 
 class HillClimbingReset(LocalSearch):
     """
     Clase que representa un algoritmo de ascenso de colinas con reinicios aleatorios.
     En cada iteración se mueve al estado sucesor con mejor valor objetivo.
     Se realiza un reinicio aleatorio cuando se alcanza un óptimo local.
+    Cada reinicio es un ascenso independiente: max_iters cuenta las
+    iteraciones sin mejorar el mejor valor del propio ascenso, con o sin
+    workers.
+
+    Con rest=False se mueve a una accion elegida al azar entre las que
+    mejoran el valor objetivo. Las acciones se sortean en lotes de samples
+    (ver OptProblem.sample_gains) y solo si un lote no contiene mejoras se
+    evaluan todas (ver OptProblem.move_gains) para confirmar el optimo local.
     """
 
-    def __init__(self, max_restarts: int = 3, max_iters: int = 10, rest: bool = False):
+    def __init__(self, max_restarts: int = 3, max_iters: int = 10, rest: bool = False,
+                 workers: int | None = None, seed: int | None = None, samples: int = 1024):
         """
         Construye una instancia de la clase HillClimbingReset.
         max_restarts: int máximo número de reinicios (por defecto, 3)
         max_iters: int numero maximo de interaciones (por defecto 10)
         type_reset: bool True para versión estocástica (por defecto False)
+        workers: int cantidad de procesos para repartir los reinicios (por defecto None, secuencial)
+        seed: int semilla de los reinicios en paralelo (por defecto None, aleatoria)
+        samples: int acciones sorteadas por lote con rest=False (por defecto 1024)
         """
         super().__init__()
         self.max_restarts = max_restarts
         self.max_iters = max_iters
         self.type_reset = rest
+        self.workers = workers
+        self.seed = seed
+        self.samples = samples
+
+    def random_improvement(self, problem: OptProblem, state: State) -> tuple[Optional[tuple], float]:
+        """
+        Elige al azar una accion que mejore el valor objetivo.
+        Cada accion de mejora tiene la misma probabilidad de ser elegida:
+        las acciones de un lote se sortean de manera uniforme, por lo que
+        basta con elegir al azar entre las mejoras del lote.
+        Argumentos:
+        ==========
+        problem: OptProblem un problema de optimización
+        state: estado actual
+        Retorno:
+        =======
+        tuple: la accion elegida (o None si es un optimo local) y su diferencia de valor objetivo
+        """
+        i, j, gain = problem.sample_gains(state, self.samples)
+        positive = np.flatnonzero(gain > 0)
+        if len(positive) == 0:
+            # Ninguna mejora en el lote, se evaluan todas las acciones
+            i, j, gain = problem.move_gains(state)
+            positive = np.flatnonzero(gain > 0)
+            if len(positive) == 0:
+                return None, 0.0
+        k = int(choice(positive))
+        return (int(i[k]), int(j[k])), float(gain[k])
+
+    def climb(self, problem: OptProblem, best_value: float) -> tuple[State, float, int]:
+        """
+        Realiza un ascenso desde el estado inicial del problema.
+        El ascenso termina al no haber acciones aplicables o tras max_iters
+        iteraciones sin superar best_value.
+        Argumentos:
+        ==========
+        problem: OptProblem un problema de optimización
+        best_value: float mejor valor objetivo encontrado hasta el momento
+        Retorno:
+        =======
+        tuple: el mejor estado del ascenso (o None si no supera best_value), su valor y las iteraciones
+        """
+        best_tour = None
+        niters = 0
+        no_improvement_count = 0
+        actual = Node(problem.encode(problem.init), problem.obj_val(problem.init))
+        # El estado actual es el mejor encontrado y aun no fue copiado
+        best_is_actual = actual.value > best_value
+        if best_is_actual:
+            # el estado inicial ya puede ser un optimo local
+            best_value = actual.value
+
+        while self.max_iters > no_improvement_count and \
+                not self.stop(self.niters + niters, best_value):
+            # Determinar las acciones que se pueden aplicar y las diferencias en valor objetivo que resultan
+            # Elegir una acción aleatoria de las que generan incremento positivo en el valor objetivo
+            if self.type_reset:
+                act, gain = problem.best_action(actual.state)
+            else:
+                act, gain = self.random_improvement(problem, actual.state)
+
+            if act is not None:
+                # Copiar el mejor estado antes de modificarlo in situ
+                if best_is_actual:
+                    best_tour = problem.decode(actual.state)
+                    best_is_actual = False
+                # Moverse a un nodo con el estado sucesor
+                actual = Node(problem.apply(actual.state, act), actual.value + gain)
+                # Guardar la mejor solución encontrada en este reinicio
+                if actual.value > best_value:
+                    best_is_actual = True
+                    best_value = actual.value
+                    no_improvement_count = 0  # Reiniciar el contador de iteraciones sin mejora
+                else:
+                    no_improvement_count += 1
+                niters += 1
+            else:
+                break
+        if best_is_actual:
+            best_tour = problem.decode(actual.state)
+        return best_tour, best_value, niters
 
     def solve(self, problem: OptProblem):
         """
@@ -116,44 +686,25 @@ class HillClimbingReset(LocalSearch):
         try:
             # Inicio del reloj
             start = time()
-            best_tour = None
-            best_value = float('-inf')
-            restarts = 0
             self.niters = 0  # Reiniciar el contador de iteraciones
-
-            while restarts < self.max_restarts:
-                # Crear el nodo inicial mediante un reinicio aleatorio
-                if restarts != 0:
-                    problem.random_reset()
-                no_improvement_count = 0
-                actual = Node(problem.init, problem.obj_val(problem.init))
-
-                while self.max_iters > no_improvement_count:
-                    # Determinar las acciones que se pueden aplicar y las diferencias en valor objetivo que resultan
-                    diff = problem.val_diff(actual.state)
-                    # Elegir una acción aleatoria de las que generan incremento positivo en el valor objetivo
-
-                    if self.type_reset:
-                        positive_diff_acts = [act for act, val in diff.items() if val == max(diff.values())]
-                    else:
-                        positive_diff_acts = [act for act, val in diff.items() if val > 0]
-
-                    if positive_diff_acts:
-                        act = choice(positive_diff_acts)
-                        # Moverse a un nodo con el estado sucesor
-                        actual = Node(problem.result(actual.state, act), actual.value + diff[act])
-                        # Guardar la mejor solución encontrada en este reinicio
-                        if actual.value > best_value:
-                            best_tour = actual.state
-                            best_value = actual.value
-                            no_improvement_count = 0  # Reiniciar el contador de iteraciones sin mejora
-                        else:
-                            no_improvement_count += 1
-                        self.niters += 1
-                    else:
+            self.begin()
+            problem = self.instrument(problem)
+            if self.workers is not None and self.workers > 1:
+                best_tour, best_value = self.solve_parallel(problem)
+            else:
+                best_tour = None
+                best_value = float('-inf')
+                for restart in range(self.max_restarts):
+                    if self.termination.reason is not None:
                         break
-                # Incrementar el contador de reinicios
-                restarts += 1
+                    # Crear el nodo inicial mediante un reinicio aleatorio
+                    if restart != 0:
+                        problem.random_reset()
+                    # Cada ascenso es independiente, igual que en solve_parallel
+                    tour, value, niters = self.climb(problem, float('-inf'))
+                    if tour is not None and value > best_value:
+                        best_tour, best_value = tour, value
+                    self.niters += niters
             # Asignar la mejor solución encontrada a las variables de la instancia
             self.tour = best_tour
             self.value = best_value
@@ -166,14 +717,166 @@ class HillClimbingReset(LocalSearch):
             self.value = None
             self.time = None
 
+    def solve_parallel(self, problem: OptProblem) -> tuple[State, float]:
+        """
+        Reparte los reinicios entre self.workers procesos.
+        Cada reinicio es un ascenso independiente con su propia semilla, de
+        modo que el resultado depende solo de self.seed. Los datos del
+        problema se comparten con los procesos una unica vez
+        (ver OptProblem.shared), no en cada reinicio. Cada proceso evalua
+        su copia de self.termination: el limite de tiempo es comun a todos
+        los reinicios y los demas criterios se aplican a cada reinicio.
+        Argumentos:
+        ==========
+        problem: OptProblem un problema de optimización
+        Retorno:
+        =======
+        tuple: el mejor estado encontrado y su valor objetivo
+        """
+        seeds = Random(self.seed).sample(range(2 ** 31), self.max_restarts)
+        best_tour = None
+        best_value = float('-inf')
+        abort = self.pool_abort()
+        with problem.shared() as (factory, args):
+            with ProcessPoolExecutor(max_workers=self.workers,
+                                     initializer=_init_worker,
+                                     initargs=(factory, args, problem.init, abort)) as executor:
+                # El primer ascenso parte del estado inicial, el resto de un reinicio aleatorio
+                futures = [executor.submit(_restart_worker, self, restart != 0, seed,
+                                           self.profile is not None)
+                           for restart, seed in enumerate(seeds)]
+                for future in futures:
+                    tour, value, niters, profile = future.result()
+                    self.niters += niters
+                    if profile is not None:
+                        self.profile.merge(profile)
+                    if tour is not None and value > best_value:
+                        best_tour, best_value = tour, value
+                    if self.stop(self.niters, best_value):
+                        # Descartar los reinicios que aun no comenzaron y detener los demas
+                        abort.set()
+                        for pending in futures:
+                            pending.cancel()
+                        break
+        return best_tour, best_value
+
+
+# Problema de cada proceso de HillClimbingReset.solve_parallel
+_worker_problem = None
+_worker_init = None
+# Evento que detiene las tareas del proceso (ver LocalSearch.pool_abort)
+_worker_abort = None
+
+
+def _init_worker(factory, args, init, abort: Event | None = None) -> None:
+    """Reconstruye el problema en un proceso a partir de sus datos compartidos."""
+    global _worker_problem, _worker_init, _worker_abort
+    _worker_problem = factory(*args)
+    _worker_init = init
+    _worker_abort = abort
+
+
+def _worker_instrument(profiling: bool) -> tuple[OptProblem, Optional[Profile]]:
+    """Problema del proceso y, si profiling es True, un perfil propio de la tarea que lo mide.
+
+    El perfil del algoritmo no se serializa (ver LocalSearch.__getstate__),
+    cada tarea retorna el suyo para acumularlo con Profile.merge.
+    """
+    if not profiling:
+        return _worker_problem, None
+    profile = Profile()
+    return profile.wrap(_worker_problem), profile
+
+
+def _restart_worker(algo: HillClimbingReset, reset: bool, seed: int,
+                    profiling: bool = False) -> tuple[State, float, int, Optional[Profile]]:
+    """Realiza un ascenso de HillClimbingReset en un proceso."""
+    seed_random(seed)
+    algo._abort = _worker_abort
+    problem, profile = _worker_instrument(profiling)
+    problem.init = _worker_init
+    if reset:
+        problem.random_reset()
+    return (*algo.climb(problem, float('-inf')), profile)
+
+
+def solve_concurrent(problem: OptProblem, algos: dict[str, LocalSearch],
+                     workers: int | None = None, seed: int | None = 0) -> None:
+    """Ejecuta varios algoritmos a la vez, cada uno en su propio proceso.
+
+    Los datos del problema se comparten con los procesos una unica vez
+    (ver OptProblem.shared) y cada algoritmo trabaja sobre una copia
+    aislada del problema que parte de problem.init. Cada algoritmo recibe
+    su propia semilla, que depende solo de seed y de su posicion en algos,
+    de modo que el resultado no depende del orden en que terminan los
+    procesos. Los resultados (tour, value, time, niters, trace y profile)
+    se copian en los objetos de algos.
+
+    Argumentos:
+    ==========
+    problem: OptProblem
+        un problema de optimizacion
+    algos: dict[str, LocalSearch]
+        algoritmos a ejecutar, indexados por nombre
+    workers: int | None
+        cantidad de procesos (por defecto None, uno por procesador)
+    seed: int | None
+        semilla de la que se derivan las de cada algoritmo
+    """
+    seeds = Random(seed).sample(range(2 ** 31), len(algos))
+    with problem.shared() as (factory, args):
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(factory, args, problem.init)) as executor:
+            # La traza y el perfil no se serializan con el algoritmo (ver LocalSearch.__getstate__)
+            futures = {name: executor.submit(_solve_worker, algo, algo.trace, algo.profile, s)
+                       for (name, algo), s in zip(algos.items(), seeds)}
+            for name, future in futures.items():
+                done, trace, profile = future.result()
+                algo = algos[name]
+                algo.tour, algo.value = done.tour, done.value
+                algo.time, algo.niters = done.time, done.niters
+                algo.trace, algo.profile = trace, profile
+
+
+def _solve_worker(algo: LocalSearch, trace: Optional[Trace], profile: Optional[Profile],
+                  seed: int) -> tuple[LocalSearch, Optional[Trace], Optional[Profile]]:
+    """Ejecuta un algoritmo de solve_concurrent en un proceso."""
+    seed_random(seed)
+    np.random.seed(seed)
+    # Un proceso puede ejecutar varios algoritmos, todos parten del mismo estado
+    _worker_problem.init = list(_worker_init)
+    algo.trace, algo.profile = trace, profile
+    algo.solve(_worker_problem)
+    return algo, algo.trace, algo.profile
+
 
 class Tabu(LocalSearch):
-    """Algoritmo de búsqueda tabú."""
+    """Algoritmo de búsqueda tabú.
+
+    En cada iteracion se mueve al mejor sucesor admisible, aunque empeore
+    el valor objetivo. Los movimientos se evaluan con diferencias de valor
+    objetivo (ver OptProblem.move_gains) y solo se construye el sucesor
+    elegido.
+
+    La memoria tabú se basa en atributos de los movimientos: al aplicar un
+    movimiento se registran los pares de elementos que se separan (las
+    aristas eliminadas en el TSP) junto con la iteracion hasta la que no
+    pueden volver a unirse. La consulta es O(1) por movimiento. Un
+    movimiento tabú es admisible si mejora la mejor solucion encontrada
+    (criterio de aspiracion).
+
+    La memoria es una matriz de n x n si el problema tiene su matriz de
+    distancias. Si las distancias se calculan a demanda (ver
+    distance.DistanceOracle) la matriz no entra en memoria, y se utiliza
+    un diccionario con solo los pares tabú vigentes.
+    """
 
     def __init__(self, tabu_list_size: float = 0.0, max_iters=None):
         """
         Construye una instancia de la clase Tabu.
         tabu_list_size: float porcentaje de la lista tabú con respecto al tamaño del problema (por defecto, 0)
+            determina la cantidad de iteraciones que un atributo permanece tabú, 0 equivale a 0.18
         max_iters: int número máximo de iteraciones (por defecto, None)
         """
         super().__init__()
@@ -181,96 +884,361 @@ class Tabu(LocalSearch):
         self.max_iters = max_iters
 
     @staticmethod
-    def get_neighbors(
-            state: List,
+    def memory(problem: OptProblem) -> np.ndarray | dict[int, int]:
+        """
+        Construye la memoria tabú vacía.
+        Retorno:
+        =======
+        tabu: una matriz de n x n, o un diccionario indexado por par (ver forbid)
+        """
+        if isinstance(getattr(problem, 'dist', None), np.ndarray):
+            return np.zeros((problem.n, problem.n), dtype=np.int32)
+        return {}
+
+    @staticmethod
+    def forbid(tabu: np.ndarray | dict[int, int], u: int, v: int, until: int, n: int) -> None:
+        """Prohibe volver a unir los elementos u y v hasta la iteracion until."""
+        if isinstance(tabu, np.ndarray):
+            tabu[u, v] = tabu[v, u] = until
+        else:
+            tabu[min(u, v) * n + max(u, v)] = until
+
+    @staticmethod
+    def is_tabu(tabu: np.ndarray | dict[int, int], u: np.ndarray, v: np.ndarray,
+                iteration: int, n: int) -> np.ndarray:
+        """Determina para cada par (u[m], v[m]) si es tabú en la iteracion iteration."""
+        if isinstance(tabu, np.ndarray):
+            return tabu[u, v] >= iteration
+        # Descartar los pares que dejaron de ser tabú
+        for key in [key for key, until in tabu.items() if until < iteration]:
+            del tabu[key]
+        if not tabu:
+            return np.zeros(len(u), dtype=bool)
+        keys = np.minimum(u, v).astype(np.int64) * n + np.maximum(u, v)
+        return np.isin(keys, np.fromiter(tabu, dtype=np.int64, count=len(tabu)))
+
+    @staticmethod
+    def best_admissible(
+            state: State,
             problem: OptProblem,
-            tabu_list: Optional[Set[tuple]] = None
-    ) -> List[Node]:
+            tabu: np.ndarray | dict[int, int],
+            iteration: int,
+            aspiration: float
+    ) -> tuple[Optional[tuple], float]:
         """
-        Obtiene los vecinos permitidos por las restricciones de la lista tabú.
+        Obtiene el mejor movimiento permitido por las restricciones tabú.
         state: estado actual
         problem: OptProblem un problema de optimización
-        tabu_list: set lista tabú que contiene los movimientos prohibidos
+        tabu: iteracion hasta la que cada par de elementos es tabú (ver memory)
+        iteration: int iteracion actual
+        aspiration: float diferencia de valor objetivo a partir de la cual un movimiento tabú es admisible
         Return
-        list: lista de vecinos permitidos junto con sus valores objetivo
+        tuple: el mejor movimiento admisible (o None) y su diferencia de valor objetivo
         """
-        neighbors = []
-        try:
-            for action in problem.actions(state):
-                # Se verifica si el movimiento es permitido por las restricciones de la lista tabú
-                if tuple(action) not in tabu_list:
-                    # Se obtiene el estado vecino aplicando la acción al estado actual
-                    neighbor_state = problem.result(state, action)
-                    # Se calcula el valor objetivo del estado vecino
-                    neighbor_value = problem.obj_val(neighbor_state)
-                    # Se agrega el vecino (estado y valor objetivo) a la lista de vecinos permitidos
-                    neighbors.append(Node(neighbor_state, neighbor_value))
-        except Exception as e:
-            logger.error(f"Se produjo un error al obtener los vecinos permitidos error={e}", exc_info=True)
-            return []
-        # Se devuelve la lista de vecinos permitidos junto con sus valores objetivo
-        return neighbors
+        i, j, gain = problem.move_gains(state)
+        u1, v1, u2, v2 = problem.added_pairs(state, i, j)
+        # Descartar in situ los movimientos tabú que no cumplen la aspiracion
+        blocked = Tabu.is_tabu(tabu, u1, v1, iteration, problem.n)
+        blocked |= Tabu.is_tabu(tabu, u2, v2, iteration, problem.n)
+        blocked &= gain <= aspiration
+        gain[blocked] = -np.inf
+        if len(gain) == 0:
+            return None, 0.0
+        best = gain.max()
+        if best == -np.inf:
+            return None, 0.0
+        k = int(choice(np.flatnonzero(gain == best)))
+        return (int(i[k]), int(j[k])), float(best)
 
-    def remove_elements_random(self, tabu_list: Set[tuple]) -> Set[tuple]:
+    def solve(self, problem: OptProblem):
         """
-        Elimina elementos aleatorios en la lista Tabú.
-        tabu_list: Set[tuple] - Lista Tabú que contiene los elementos a eliminar.
-        Return
-        Set[tuple]: Lista Tabú modificada después de eliminar elementos aleatorios.
+        Resuelve un problema de optimización con Búsqueda Tabú.
+        Argumentos:
+        ==========
+        problem: OptProblem - Un problema de optimización.
         """
         try:
-            if len(tabu_list) > self.tabu_list_size:
-                tabu_list = set(sample(list(tabu_list), self.tabu_list_size))
-            return tabu_list
+            # Inicio del reloj
+            start = time()
+            problem = self.instrument(problem)
+            size = float(self.tabu_list_size) if self.tabu_list_size else 0.18
+            tenure = max(1, int(len(problem.init) * size))
+            max_iters = self.max_iters if self.max_iters is not None else len(problem.init)
+            # Iteracion hasta la que cada par de elementos es tabú
+            tabu = self.memory(problem)
+
+            actual = Node(problem.encode(problem.init), problem.obj_val(problem.init))
+            best_tour = problem.decode(actual.state)
+            best_value = actual.value
+            # El estado actual es el mejor encontrado y aun no fue copiado
+            best_is_actual = False
+            self.begin()
+            for iteration in range(1, max_iters + 1):
+                if self.stop(self.niters, best_value):
+                    break
+                # Elegir el movimiento admisible con el mejor valor objetivo
+                act, gain = self.best_admissible(actual.state, problem, tabu, iteration,
+                                                 best_value - actual.value)
+                if act is None:
+                    break
+                if best_is_actual:
+                    best_tour = problem.decode(actual.state)
+                    best_is_actual = False
+                # Prohibir volver a unir los pares que separa el movimiento
+                for u, v in problem.removed_pairs(actual.state, act):
+                    self.forbid(tabu, int(u), int(v), iteration + tenure, problem.n)
+                # Moverse al sucesor elegido
+                actual = Node(problem.apply(actual.state, act), actual.value + gain)
+                self.niters += 1
+                if actual.value > best_value:
+                    best_value = actual.value
+                    best_is_actual = True
+            self.stop(self.niters, best_value)  # registrar la ultima mejora
+            if best_is_actual:
+                best_tour = problem.decode(actual.state)
+            # Asignar la mejor solución encontrada a las variables de la instancia
+            self.tour = best_tour
+            self.value = best_value
+            # Finalizar el reloj
+            end = time()
+            self.time = end - start
         except Exception as e:
-            logger.error(f"Se produjo un error al eliminar elementos de la lista Tabú: {e}", exc_info=True)
-            return set()
+            logger.error(f"Se produjo un error en el método solve: {e}", exc_info=True)
+            self.tour = None
+            self.value = None
+            self.time = None
+
+
+class Genetic(LocalSearch):
+    """Algoritmo genetico memetico.
+
+    Mantiene una poblacion de estados en un arreglo de numpy, con un estado
+    [0, ..., 0] por fila, por lo que los estados deben ser permutaciones
+    como en el TSP. En cada generacion se eligen padres por torneo, se
+    cruzan con order crossover (OX) y cada hijo se pule con un ascenso
+    2-opt de primer mejora (ver descend) que solo examina las ciudades de
+    las aristas que no hereda de sus padres. Si el problema no tiene
+    listas de vecinos, el ascenso utiliza las de sus neighbors ciudades
+    mas cercanas. Los valores objetivo de cada
+    generacion se calculan a la vez (ver OptProblem.obj_vals). La nueva
+    poblacion son los mejores estados distintos entre padres e hijos.
+
+    Con workers > 1 los hijos de cada generacion se pulen en un grupo de
+    procesos que reciben los datos del problema una unica vez (ver
+    OptProblem.shared).
+
+    El criterio de parada (ver LocalSearch.stop) se verifica durante cada
+    ascenso y entre un hijo y el siguiente; los estados que no llegan a
+    pulirse se evaluan tal como estan.
+    """
+
+    def __init__(self, population: int = 20, generations: int = 50, offspring: int | None = None,
+                 mutation: float = 0.1, workers: int | None = None, neighbors: int | None = 10):
+        """
+        Construye una instancia de la clase Genetic.
+        population: int cantidad de estados de la poblacion (por defecto, 20)
+        generations: int número máximo de generaciones (por defecto, 50)
+        offspring: int hijos por generación (por defecto None, igual a population)
+        mutation: float probabilidad de aplicar una acción aleatoria a cada hijo (por defecto, 0.1)
+        workers: int cantidad de procesos para pulir los hijos (por defecto None, secuencial)
+        neighbors: int vecinos candidatos por ciudad si el problema no tiene listas de vecinos
+            (por defecto 10, None para examinar todas las ciudades)
+        """
+        super().__init__()
+        self.population = population
+        self.generations = generations
+        self.offspring = offspring if offspring is not None else population
+        self.mutation = mutation
+        self.workers = workers
+        self.neighbors = neighbors
+
+    def halted(self) -> bool:
+        """Determina si se cumple el criterio de parada, sin registrar un nuevo valor."""
+        return self.monitoring and self.stop(self.niters, self._best)
+
+    @staticmethod
+    def crossover(parent1: np.ndarray, parent2: np.ndarray) -> np.ndarray:
+        """
+        Cruza dos estados con order crossover (OX).
+        El hijo copia un segmento aleatorio de parent1 en las mismas
+        posiciones y completa el resto con las ciudades que faltan en el
+        orden en que aparecen en parent2 a partir del final del segmento.
+        La primera ciudad (la del inicio y fin del tour) no se mueve.
+        Argumentos:
+        ==========
+        parent1, parent2: np.ndarray estados [0, ..., 0]
+        Retorno:
+        =======
+        child: np.ndarray el estado hijo
+        """
+        inner1, inner2 = parent1[1:-1], parent2[1:-1]
+        m = len(inner1)
+        a, b = sorted(sample(range(m + 1), 2))
+        segment = inner1[a:b]
+        taken = np.zeros(m + 1, dtype=bool)
+        taken[segment] = True
+        rest = np.roll(inner2, -b)
+        rest = rest[~taken[rest]]
+        child = np.empty_like(parent1)
+        child[0] = child[-1] = parent1[0]
+        inner = child[1:-1]
+        inner[a:b] = segment
+        inner[np.roll(np.arange(m), -b)[:m - (b - a)]] = rest
+        return child
+
+    @staticmethod
+    def new_edges(child: np.ndarray, parent1: np.ndarray, parent2: np.ndarray) -> list[int]:
+        """
+        Determina las ciudades de las aristas del hijo que no estan en sus padres.
+        Las aristas heredadas ya fueron pulidas en los padres, por lo que
+        el ascenso solo necesita examinar estas ciudades.
+        """
+        succ1 = np.empty(len(child) - 1, dtype=np.intp)
+        succ2 = np.empty_like(succ1)
+        succ1[parent1[:-1]] = parent1[1:]
+        succ2[parent2[:-1]] = parent2[1:]
+        u, v = child[:-1], child[1:]
+        inherited = (succ1[u] == v) | (succ1[v] == u) | (succ2[u] == v) | (succ2[v] == u)
+        return np.unique(np.concatenate((u[~inherited], v[~inherited]))).tolist()
+
+    @staticmethod
+    def tournament(values: np.ndarray) -> int:
+        """Elige el mejor de dos estados de la poblacion tomados al azar."""
+        a, b = randrange(len(values)), randrange(len(values))
+        return a if values[a] >= values[b] else b
+
+    def select(self, states: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Elige los self.population mejores estados, ordenados por valor objetivo.
+        Los estados con el mismo valor objetivo se consideran repetidos y
+        solo se eligen si no alcanzan los estados distintos, de modo de
+        conservar la diversidad de la poblacion.
+        """
+        order = np.argsort(-values, kind='stable')
+        _, first = np.unique(values[order], return_index=True)
+        keep = order[np.sort(first)][:self.population]
+        if len(keep) < self.population:
+            repeated = order[~np.isin(order, keep)]
+            keep = np.concatenate((keep, repeated[:self.population - len(keep)]))
+        return states[keep], values[keep]
+
+    def mutate(self, problem: OptProblem, child: np.ndarray, keys: list) -> np.ndarray:
+        """Aplica una accion aleatoria al hijo, agregando a keys los elementos afectados."""
+        state = problem.encode(child.tolist())
+        act = problem.random_action(state)
+        if act is None:
+            return child
+        keys.extend(problem.touched(state, act))
+        state = problem.apply(state, act)
+        return np.asarray(problem.decode(state), dtype=child.dtype)
+
+    def polish_one(self, problem: OptProblem, state: np.ndarray, keys: list | None) -> list:
+        """
+        Pule un estado con un ascenso 2-opt de primer mejora (ver descend).
+        keys: list | None elementos a examinar (None para todos)
+        """
+        moves = problem.neighborhood('2opt', neighbors=self.neighbors)
+        # la copia conoce su valor objetivo, que stop_from recibe sin recorrerla
+        work = problem.encode(state.tolist(), evaluated=True)
+        if keys is None:
+            keys = problem.keys(work)
+        work, _, _ = descend(moves, work, keys, self.stop_from(self.niters, problem.obj_val(work)))
+        return problem.decode(work)
+
+    def polish(self, problem: OptProblem, states: np.ndarray, keys: list[list] | None,
+               executor: ProcessPoolExecutor | None) -> np.ndarray:
+        """
+        Pule cada estado (ver polish_one) hasta que se cumpla el criterio de parada.
+        keys: list[list] | None elementos a examinar de cada estado (None para todos)
+        executor: ProcessPoolExecutor | None grupo de procesos, o None para pulir en este proceso
+        """
+        if keys is None:
+            keys = [None] * len(states)
+        polished = np.array(states)
+        if executor is None:
+            for c, (state, k) in enumerate(zip(states, keys)):
+                if self.halted():
+                    break
+                polished[c] = self.polish_one(problem, state, k)
+        else:
+            futures = [executor.submit(_polish_worker, self, state, k, self.profile is not None)
+                       for state, k in zip(states, keys)]
+            for c, future in enumerate(futures):
+                if self.halted():
+                    # Descartar los ascensos que aun no comenzaron y detener los demas
+                    self._pool_abort.set()
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                polished[c], profile = future.result()
+                if profile is not None:
+                    self.profile.merge(profile)
+        return polished
+
+    def evolve(self, problem: OptProblem,
+               executor: ProcessPoolExecutor | None) -> tuple[np.ndarray, float]:
+        """
+        Evoluciona una poblacion a partir del estado inicial del problema.
+        Retorno:
+        =======
+        tuple: el mejor estado encontrado y su valor objetivo
+        """
+        # Poblacion inicial: el estado inicial y reinicios aleatorios, pulidos
+        init = problem.init
+        states = [list(init)]
+        for _ in range(self.population - 1):
+            if self.halted():
+                break
+            problem.random_reset()
+            states.append(problem.init)
+        problem.init = init
+        pop = self.polish(problem, np.array(states), None, executor)
+        pop, values = self.select(pop, problem.obj_vals(pop))
+
+        for _ in range(self.generations):
+            if self.stop(self.niters, float(values[0])):
+                break
+            children = np.empty((self.offspring, pop.shape[1]), dtype=pop.dtype)
+            keys = []
+            for c in range(self.offspring):
+                a, b = self.tournament(values), self.tournament(values)
+                children[c] = self.crossover(pop[a], pop[b])
+                keys.append(self.new_edges(children[c], pop[a], pop[b]))
+                if random() < self.mutation:
+                    children[c] = self.mutate(problem, children[c], keys[c])
+            children = self.polish(problem, children, keys, executor)
+            pop, values = self.select(np.vstack((pop, children)),
+                                      np.concatenate((values, problem.obj_vals(children))))
+            self.niters += 1
+        self.stop(self.niters, float(values[0]))  # registrar la ultima mejora
+        return pop[0], float(values[0])
 
     def solve(self, problem: OptProblem):
         """
-        Resuelve un problema de optimización con Búsqueda Tabú.
+        Resuelve un problema de optimización con un algoritmo genético.
         Argumentos:
         ==========
-        problem: OptProblem - Un problema de optimización.
+        problem: OptProblem un problema de optimización
         """
         try:
             # Inicio del reloj
             start = time()
-            tabu_list = set()
-
-            if self.tabu_list_size == 0.0:
-                self.tabu_list_size = int(len(problem.init) * 0.18)
+            self.niters = 0
+            self.begin()
+            problem = self.instrument(problem)
+            if self.workers is not None and self.workers > 1:
+                self._pool_abort = self.pool_abort()
+                with problem.shared() as (factory, args):
+                    with ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=_init_worker,
+                                             initargs=(factory, args, problem.init,
+                                                       self._pool_abort)) as executor:
+                        best_tour, best_value = self.evolve(problem, executor)
             else:
-                self.tabu_list_size = int(len(problem.init)*float(self.tabu_list_size))
-            if self.max_iters is None:
-                self.max_iters = len(problem.init)
-            iter_count = 0
-            actual = Node(problem.init, problem.obj_val(problem.init))
-            while iter_count < self.max_iters:
-                # Obtener los vecinos permitidos por las restricciones de la lista tabú
-                neighbors = self.get_neighbors(actual.state, problem, tabu_list)
-                # Elegir el vecino con el mejor valor objetivo
-                best_neighbor = max(neighbors, key=lambda x: x.value)
-                # Retornar si estamos en un óptimo local
-                if best_neighbor.value <= actual.value:
-                    self.tour = actual.state
-                    self.value = actual.value
-                    end = time()
-                    self.time = end - start
-                    return
-                else:
-                    # Moverse al vecino seleccionado
-                    actual = best_neighbor
-                    # Agregar el movimiento a la lista Tabú
-                    tabu_list.add(tuple(best_neighbor.state))
-                    if len(tabu_list) > self.tabu_list_size:
-                        # Eliminar elementos aleatorios en la lista Tabú
-                        tabu_list = self.remove_elements_random(tabu_list)
-                    iter_count += 1
-                    self.niters += 1
+                best_tour, best_value = self.evolve(problem, None)
             # Asignar la mejor solución encontrada a las variables de la instancia
-            self.tour = actual.state
-            self.value = actual.value
+            self.tour = best_tour.tolist()
+            self.value = best_value
             # Finalizar el reloj
             end = time()
             self.time = end - start
@@ -279,3 +1247,12 @@ class Tabu(LocalSearch):
             self.tour = None
             self.value = None
             self.time = None
+
+
+def _polish_worker(algo: Genetic, state: np.ndarray, keys: list | None,
+                   profiling: bool = False) -> tuple[list, Optional[Profile]]:
+    """Pule un estado de Genetic.polish en un proceso."""
+    algo._abort = _worker_abort
+    problem, profile = _worker_instrument(profiling)
+    return algo.polish_one(problem, state, keys), profile
+
@@ -0,0 +1,92 @@
+"""Este modulo define la clase Termination.
+
+Termination representa un criterio de parada compartido por todos los
+algoritmos de busqueda local (ver search.LocalSearch.termination). Combina
+los siguientes criterios, cualquiera de ellos detiene la busqueda:
+
+* time_limit: tiempo de ejecucion maximo, en segundos.
+* max_iters: cantidad maxima de iteraciones.
+* stagnation: cantidad maxima de iteraciones sin mejorar el mejor valor
+objetivo encontrado.
+* target: valor objetivo a alcanzar. En el TSP el valor objetivo es el
+opuesto de la longitud, por lo que target = -longitud.
+
+Los algoritmos llaman a self.stop(niters, value) en cada iteracion de su
+ciclo principal, por lo que la verificacion es O(1) y sin asignaciones.
+Un criterio sin limites (el valor por defecto) nunca detiene la busqueda,
+y los algoritmos conservan su propio criterio de parada.
+"""
+
+from __future__ import annotations
+from time import time
+
+
+class Termination:
+    """Clase que representa un criterio de parada de una busqueda local."""
+
+    def __init__(self, time_limit: float | None = None, max_iters: int | None = None,
+                 stagnation: int | None = None, target: float | None = None) -> None:
+        """Construye una instancia de la clase.
+
+        Argumentos:
+        ==========
+        time_limit: float | None
+            tiempo maximo en segundos (por defecto None, sin limite)
+        max_iters: int | None
+            cantidad maxima de iteraciones (por defecto None, sin limite)
+        stagnation: int | None
+            cantidad maxima de iteraciones sin mejora (por defecto None, sin limite)
+        target: float | None
+            valor objetivo a alcanzar (por defecto None, sin objetivo)
+        """
+        self.time_limit = time_limit
+        self.max_iters = max_iters
+        self.stagnation = stagnation
+        self.target = target
+        # True si algun criterio puede detener la busqueda
+        self.active = any(c is not None for c in (time_limit, max_iters, stagnation, target))
+        self.start()
+
+    def __repr__(self):
+        """Representacion del criterio de parada."""
+        return "<Termination time_limit={} max_iters={} stagnation={} target={}>".format(
+            self.time_limit, self.max_iters, self.stagnation, self.target)
+
+    def start(self) -> None:
+        """Reinicia el criterio al comenzar una busqueda."""
+        self.deadline = time() + self.time_limit if self.time_limit is not None else None
+        self.best = float('-inf')
+        self.best_iter = 0
+        self.reason = None  # criterio que detuvo la busqueda
+
+    def stop(self, niters: int, value: float) -> bool:
+        """Determina si la busqueda debe detenerse.
+
+        Argumentos:
+        ==========
+        niters: int
+            iteraciones realizadas por el algoritmo
+        value: float
+            mejor valor objetivo encontrado
+
+        Retorno:
+        =======
+        stop: bool
+            True si se cumple algun criterio, que se guarda en self.reason
+        """
+        if not self.active:
+            return False
+        if value > self.best:
+            self.best = value
+            self.best_iter = niters
+        if self.target is not None and value >= self.target:
+            self.reason = 'target'
+        elif self.max_iters is not None and niters >= self.max_iters:
+            self.reason = 'max_iters'
+        elif self.stagnation is not None and niters - self.best_iter >= self.stagnation:
+            self.reason = 'stagnation'
+        elif self.deadline is not None and time() >= self.deadline:
+            self.reason = 'time_limit'
+        else:
+            return False
+        return True
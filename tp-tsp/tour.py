@@ -0,0 +1,248 @@
+"""Este modulo define la clase Tour.
+
+Tour es una representacion compacta de un tour del TSP, pensada para
+aplicar movimientos in situ durante una busqueda local.
+
+El tour se almacena como un arreglo de numpy (int32) con el orden de las
+ciudades, junto con el arreglo inverso de posiciones:
+    order[pos[c]] == c    para toda ciudad c.
+El tour es ciclico, la posicion n equivale a la posicion 0.
+
+EvaluatedTour es un Tour que ademas conoce su longitud y la actualiza en
+O(1) en cada movimiento. Cada REVALIDATE movimientos la recalcula en O(n)
+para descartar el error de redondeo acumulado.
+
+Requiere del paquete numpy.
+"""
+
+from __future__ import annotations
+from typing import Any, Iterator, Sequence
+import numpy as np
+
+# Cantidad de movimientos entre dos recalculos completos de la longitud
+REVALIDATE = 1024
+
+
+class Tour:
+    """Clase que representa un tour con acceso a posiciones en O(1)."""
+
+    def __init__(self, state: Sequence[int]) -> None:
+        """Construye una instancia de la clase.
+
+        Argumentos:
+        ==========
+        state: Sequence[int]
+            un estado del TSP, de la forma [0, ..., 0], o una permutacion
+            de las ciudades (sin repetir la primera al final)
+        """
+        order = np.array(state, dtype=np.int32)
+        if len(order) > 1 and order[0] == order[-1]:
+            order = order[:-1]
+        self.n = len(order)
+        self.order = order
+        self.pos = np.empty(self.n, dtype=np.int32)
+        self.pos[order] = np.arange(self.n, dtype=np.int32)
+
+    def __repr__(self):
+        """Representacion del tour."""
+        return "<Tour {}>".format(self.tolist())
+
+    def __len__(self) -> int:
+        """Cantidad de ciudades del tour."""
+        return self.n
+
+    def __getitem__(self, k: int) -> int:
+        """Ciudad en la posicion k (modulo n), como en el estado [0, ..., 0]."""
+        return int(self.order[k % self.n])
+
+    def __iter__(self) -> Iterator[int]:
+        """Recorre las ciudades del tour, cerrando el ciclo."""
+        yield from self.order.tolist()
+        yield int(self.order[0])
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Arreglo cerrado [v_0, ..., v_n-1, v_0], compatible con los estados."""
+        closed = np.append(self.order, self.order[0])
+        return closed if dtype is None else closed.astype(dtype)
+
+    def copy(self) -> Tour:
+        """Retorna una copia del tour."""
+        other = self.__class__.__new__(self.__class__)
+        other.n = self.n
+        other.order = self.order.copy()
+        other.pos = self.pos.copy()
+        return other
+
+    def tolist(self) -> list[int]:
+        """Retorna el estado [0, ..., 0] equivalente al tour."""
+        start = int(self.pos[0])
+        order = self.order.tolist()
+        return order[start:] + order[:start] + [0]
+
+    def next(self, city: int) -> int:
+        """Sucesor de una ciudad en el tour."""
+        return int(self.order[(self.pos[city] + 1) % self.n])
+
+    def prev(self, city: int) -> int:
+        """Predecesor de una ciudad en el tour."""
+        return int(self.order[self.pos[city] - 1])
+
+    def between(self, a: int, b: int, c: int) -> bool:
+        """Determina si b se encuentra en el camino de a hacia c.
+
+        El camino se recorre en el sentido del tour y es inclusivo en ambos
+        extremos.
+        """
+        pa, pb, pc = self.pos[a], self.pos[b], self.pos[c]
+        if pa <= pc:
+            return bool(pa <= pb <= pc)
+        return bool(pb >= pa or pb <= pc)
+
+    def reverse(self, i: int, j: int) -> None:
+        """Invierte in situ el segmento de posiciones i, i+1, ..., j.
+
+        Si i > j el segmento da la vuelta al final del arreglo.
+        """
+        n = self.n
+        i, j = i % n, j % n
+        order, pos = self.order, self.pos
+        if i <= j:
+            seg = order[i:j + 1][::-1].copy()
+            order[i:j + 1] = seg
+            pos[seg] = np.arange(i, j + 1, dtype=np.int32)
+        else:
+            idx = np.arange(i, j + n + 1) % n
+            seg = order[idx[::-1]]
+            order[idx] = seg
+            pos[seg] = idx
+
+    def two_opt(self, i: int, j: int) -> None:
+        """Aplica in situ la accion 2-opt (i, j), con 0 <= i < j < n.
+
+        Se eliminan las aristas (v_i, v_i+1) y (v_j, v_j+1) y se agregan
+        (v_i, v_j) y (v_i+1, v_j+1). Para ello alcanza con invertir el
+        segmento v_i+1, ..., v_j o su complemento v_j+1, ..., v_i;
+        siempre se invierte el mas corto.
+        """
+        inner = j - i
+        if inner <= self.n - inner:
+            self.reverse(i + 1, j)
+        else:
+            self.reverse(j + 1, i)
+
+    def swap(self, i: int, j: int) -> None:
+        """Intercambia in situ las ciudades de las posiciones i y j."""
+        n = self.n
+        i, j = i % n, j % n
+        order, pos = self.order, self.pos
+        a, b = order[i], order[j]
+        order[i], order[j] = b, a
+        pos[a], pos[b] = j, i
+
+    def exchange(self, a: int, b: int, c: int, d: int) -> None:
+        """Aplica in situ el movimiento 2-opt que elimina dos aristas.
+
+        Se eliminan las aristas {a, b} y {c, d}, que deben existir y no
+        compartir ciudades, y se agregan las unicas otras dos aristas que
+        mantienen un tour.
+        """
+        order, pos, n = self.order, self.pos, self.n
+        i = int(pos[a]) if order[(pos[a] + 1) % n] == b else int(pos[b])
+        j = int(pos[c]) if order[(pos[c] + 1) % n] == d else int(pos[d])
+        self.two_opt(min(i, j), max(i, j))
+
+
+class EvaluatedTour(Tour):
+    """Clase que representa un tour junto con su longitud.
+
+    Todos los movimientos de Tour se implementan con reverse y swap, que
+    actualizan self.length a partir de las aristas que eliminan y agregan.
+    Las distancias deben ser simetricas.
+    """
+
+    def __init__(self, state: Sequence[int], dist: Any, revalidate: int = REVALIDATE) -> None:
+        """Construye una instancia de la clase.
+
+        Argumentos:
+        ==========
+        state: Sequence[int]
+            un estado del TSP (ver Tour)
+        dist: Any
+            matriz de distancias, o un objeto indexable como una matriz
+            (ver distance.DistanceOracle)
+        revalidate: int
+            cantidad de movimientos entre dos recalculos completos de la
+            longitud (por defecto REVALIDATE)
+        """
+        super().__init__(state)
+        self.dist = dist
+        self.revalidate = revalidate
+        self.validate()
+
+    def __repr__(self):
+        """Representacion del tour."""
+        return "<EvaluatedTour {} length={}>".format(self.tolist(), self.length)
+
+    def copy(self) -> EvaluatedTour:
+        """Retorna una copia del tour, con su longitud."""
+        other = super().copy()
+        other.dist = self.dist
+        other.revalidate = self.revalidate
+        other.length = self.length
+        other.moves = self.moves
+        return other
+
+    def validate(self) -> float:
+        """Recalcula la longitud del tour en O(n).
+
+        Retorno:
+        =======
+        drift: float
+            diferencia entre la longitud calculada y la acumulada (0 si
+            aun no habia una longitud)
+        """
+        order = self.order
+        length = float(self.dist[order, np.roll(order, -1)].sum())
+        drift = length - getattr(self, 'length', length)
+        self.length = length
+        self.moves = 0
+        return drift
+
+    def _moved(self, diff: float) -> None:
+        """Acumula la diferencia de longitud de un movimiento."""
+        self.length += diff
+        self.moves += 1
+        if self.moves >= self.revalidate:
+            self.validate()
+
+    def reverse(self, i: int, j: int) -> None:
+        """Invierte in situ el segmento de posiciones i, ..., j (ver Tour.reverse).
+
+        Se reemplazan las aristas (v_i-1, v_i) y (v_j, v_j+1) por
+        (v_i-1, v_j) y (v_i, v_j+1).
+        """
+        n = self.n
+        if (j - i) % n + 1 >= n:
+            # invertir el ciclo completo no cambia sus aristas
+            super().reverse(i, j)
+            return
+        order, dist = self.order, self.dist
+        a, b = order[(i - 1) % n], order[i % n]
+        c, d = order[j % n], order[(j + 1) % n]
+        diff = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+        super().reverse(i, j)
+        self._moved(float(diff))
+
+    def swap(self, i: int, j: int) -> None:
+        """Intercambia in situ las ciudades de las posiciones i y j (ver Tour.swap)."""
+        n = self.n
+        # aristas (k, k+1) que tocan las posiciones i o j, sin repetir
+        edges = {k % n for k in (i - 1, i, j - 1, j)}
+        before = self._edges_length(edges)
+        super().swap(i, j)
+        self._moved(self._edges_length(edges) - before)
+
+    def _edges_length(self, edges: set[int]) -> float:
+        """Suma de las aristas (v_k, v_k+1) para cada posicion k de edges."""
+        order, dist, n = self.order, self.dist, self.n
+        return float(sum(dist[order[k], order[(k + 1) % n]] for k in edges))